@@ -0,0 +1,280 @@
+# cli.py
+# Headless entry point for scripted/cron use: no tkinter, no display.
+#
+#   python cli.py validate data/investments.csv
+#   python cli.py summary --by asset_type --prices data/prices --format csv
+#   python cli.py import-prices AAPL.csv TSLA.csv
+#   python cli.py indicator ema AAPL --period 20 --start 2024-01-01 --plot ema.png
+#   python cli.py simulate 150 --days 90 --seed 1
+#   python cli.py risk --paths 20000 --days 30 --model gbm
+#   python cli.py bench-startup
+#   python cli.py summary --metrics run.json               # timings/counters of the run
+#
+# Only argparse/json/sys are imported up front. Each command imports what
+# it needs (NumPy for most), and matplotlib only when --plot asks for a
+# picture, so `--help` and a failed argument check cost a few milliseconds.
+# Results are lists of flat rows, written as JSON (default) or CSV.
+# Exit status: 0 ok, 1 invalid rows found (validate/import) or a data error, 2 bad arguments.
+
+import argparse
+import json
+import sys
+
+PORTFOLIO = "data/investments.csv"
+PRICES = "data/prices"
+
+
+#  commands: each returns a list of dict rows
+def cmd_validate(args):
+    """Every bad value in a portfolio CSV; an empty list means the file is clean."""
+    _, errors = _load(args.file)
+    args.failed = bool(errors)
+    return [e._asdict() for e in errors]
+
+
+def cmd_summary(args):
+    """Cost, value and P&L per ticker or asset type, plus a TOTAL row."""
+    from logic.valuation import Valuation
+    portfolio, _ = _load(args.file)
+    valuation = Valuation(portfolio)
+    if args.prices:
+        from logic.prices import PriceStore
+        held = portfolio.totals_by("ticker", measure="quantity")
+        valuation.update(PriceStore(args.prices).latest_prices(held, on=args.on))
+    groups = valuation.by_ticker() if args.by == "ticker" else valuation.by_asset_type()
+    rows = [{args.by: name, **_rounded(totals)} for name, totals in sorted(groups.items())]
+    summary = valuation.summary()
+    rows.append({args.by: "TOTAL", "cost": round(summary["cost"], 2), "value": round(summary["value"], 2),
+                 "pnl": round(summary["pnl"], 2)})
+    if summary["unpriced"]:
+        print(f"valued at cost (no price): {', '.join(summary['unpriced'])}", file=sys.stderr)
+    return rows
+
+
+def cmd_import_prices(args):
+    """Load daily price CSVs into the price store; bad rows go to stderr."""
+    from logic.prices import PriceStore
+    store = PriceStore(args.prices)
+    rows = []
+    for path in args.files:
+        written, errors = store.import_csv(path)
+        rows.extend({"file": path, "ticker": t, "rows": n} for t, n in sorted(written.items()))
+        for e in errors:
+            print(f"{path} line {e.line}: {e.message} ({e.value!r})", file=sys.stderr)
+        args.failed = args.failed or bool(errors)
+    return rows
+
+
+def cmd_indicator(args):
+    """An indicator over a ticker's stored closes: ema, zscore, or minmax."""
+    from logic import indicators
+    from logic.prices import PriceStore
+    dates, closes = PriceStore(args.prices).series(args.ticker, args.start, args.end)
+    if not len(dates):
+        raise ValueError(f"No stored prices for {args.ticker.upper()} in that range.")
+    days = [str(d) for d in dates]
+    if args.name == "minmax":
+        lo, hi, lo_idx, hi_idx = indicators.min_max(closes)
+        rows = [{"which": "min", "date": days[lo_idx], "close": lo},
+                {"which": "max", "date": days[hi_idx], "close": hi}]
+        _plot(args.plot, f"{args.ticker.upper()} close", dates, {"Close": closes},
+              markers={"Min": (dates[lo_idx], lo), "Max": (dates[hi_idx], hi)})
+        return rows
+    if args.name == "ema":
+        values, label = indicators.ema(closes, args.period), f"EMA({args.period})"
+        _plot(args.plot, f"{args.ticker.upper()} close", dates, {"Close": closes, label: values})
+    else:
+        values, label = indicators.z_score_normalisation(closes), "Z-score"
+        _plot(args.plot, f"{args.ticker.upper()} z-score", dates, {label: values})
+    return [{"date": d, "close": float(c), args.name: round(float(v), 4)} for d, c, v in zip(days, closes, values)]
+
+
+def cmd_simulate(args):
+    """One random-walk path from a start price, as the GUI's Simulate Graph draws it."""
+    import random
+    from logic.jobs import simulate_prices
+    if args.seed is not None:
+        random.seed(args.seed)
+    dates, prices = simulate_prices(args.price, args.days, args.max_pct)
+    _plot(args.plot, "Simulated price", dates, {"Simulated": prices})
+    return [{"date": d.isoformat(), "price": p} for d, p in zip(dates, prices)]
+
+
+def cmd_risk(args):
+    """Monte Carlo value at risk of the whole portfolio (one row)."""
+    from logic import montecarlo
+    portfolio, _ = _load(args.file)
+    _, start, quantities = montecarlo.holdings(portfolio)
+    params = {"model": args.model}
+    if args.model == "gbm":
+        params.update(drift=args.drift, volatility=args.volatility)
+    values = montecarlo.portfolio_paths(start, quantities, args.days, args.paths, seed=args.seed, **params)
+    if args.plot:
+        bands = montecarlo.percentile_bands(values)
+        _plot(args.plot, "Portfolio value", range(args.days), {f"P{p}": v for p, v in bands.items()})
+    risk = montecarlo.risk_summary(values, args.level)
+    return [{"days": args.days, "paths": args.paths, "model": args.model,
+             **{k: round(v, 2) if k != "level" else v for k, v in risk.items()}}]
+
+
+def cmd_bench_startup(args):
+    """Wall time of fresh interpreters running the CLI, and whether heavy modules got imported."""
+    import os
+    import subprocess
+    import time
+    here = os.path.dirname(os.path.abspath(__file__))
+    check = ("import sys, runpy; sys.argv = ['cli.py', '--help']\n"
+             "try: runpy.run_path('cli.py', run_name='__main__')\n"
+             "except SystemExit: pass\n"
+             "heavy = [m for m in ('numpy', 'tkinter', 'matplotlib') if m in sys.modules]\n"
+             "sys.stderr.write(','.join(heavy))")
+    cases = [("python -c pass", [sys.executable, "-c", "pass"]),
+             ("cli.py --help", [sys.executable, "cli.py", "--help"]),
+             ("main.py --help", [sys.executable, "main.py", "--help"]),
+             ("cli.py simulate", [sys.executable, "cli.py", "simulate", "100", "--seed", "1"])]
+    rows = []
+    for label, command in cases:
+        times = []
+        for _ in range(args.runs):
+            t = time.perf_counter()
+            subprocess.run(command, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - t)
+        times.sort()
+        rows.append({"command": label, "best_ms": round(times[0] * 1000, 1),
+                     "median_ms": round(times[len(times) // 2] * 1000, 1)})
+    heavy = subprocess.run([sys.executable, "-c", check], cwd=here, capture_output=True, text=True).stderr
+    rows.append({"command": "heavy modules after --help", "best_ms": None, "median_ms": None,
+                 "loaded": heavy or "none"})
+    return rows
+
+
+#  helpers
+def _load(path):
+    """(Portfolio, [RowError, ...]) from a CSV, bad rows skipped (no journal, no snapshot)."""
+    from logic.data_handler import Portfolio
+    portfolio = Portfolio()
+    try:
+        open(path).close()  # load_csv_bulk treats a missing file as an empty portfolio
+    except OSError as e:
+        raise ValueError(f"Cannot read {path}: {e.strerror}.")
+    return portfolio, portfolio.load_csv_bulk(path)
+
+
+def _rounded(totals):
+    return {k: round(v, 2) if isinstance(v, float) else v for k, v in totals.items()}
+
+
+def _plot(path, title, x, series, markers=None):
+    """Save a PNG of the series; matplotlib is only imported here, with no GUI backend."""
+    if not path:
+        return
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=(10, 4), dpi=100)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    for label, y in series.items():
+        ax.plot(x, y, linewidth=1.5, label=label)
+    for label, (mx, my) in (markers or {}).items():
+        ax.plot([mx], [my], "o", label=label)
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc="upper left")
+    figure.autofmt_xdate()
+    figure.savefig(path)
+
+
+def _write(rows, fmt, out):
+    if fmt == "json":
+        json.dump(rows, out, indent=2, default=str)
+        out.write("\n")
+        return
+    import csv
+    fields = list(dict.fromkeys(k for row in rows for k in row))  # every column, first-seen order
+    writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def build_parser():
+    output = argparse.ArgumentParser(add_help=False)  # shared by every command
+    output.add_argument("--format", choices=("json", "csv"), default="json", help="output format (default json)")
+    output.add_argument("-o", "--output", help="write to this file instead of stdout")
+    output.add_argument("--metrics", help="also write timings/counters of the run here (.json or .csv)")
+    parser = argparse.ArgumentParser(prog="cli.py", description="Investment Management System, headless.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = lambda name, **kwargs: sub.add_parser(name, parents=[output], **kwargs)
+
+    p = add("validate", help="check a portfolio CSV, list every bad value")
+    p.add_argument("file", nargs="?", default=PORTFOLIO)
+    p.set_defaults(run=cmd_validate)
+
+    p = add("summary", help="cost/value/P&L per ticker or asset type")
+    p.add_argument("file", nargs="?", default=PORTFOLIO)
+    p.add_argument("--by", choices=("ticker", "asset_type"), default="ticker")
+    p.add_argument("--prices", help=f"price store folder to value at last close (e.g. {PRICES})")
+    p.add_argument("--on", help="value at the last close on or before this date (YYYY-MM-DD)")
+    p.set_defaults(run=cmd_summary)
+
+    p = add("import-prices", help="import daily price CSVs (date + close columns)")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--prices", default=PRICES, help="price store folder")
+    p.set_defaults(run=cmd_import_prices)
+
+    p = add("indicator", help="ema, zscore or minmax over a ticker's stored closes")
+    p.add_argument("name", choices=("ema", "zscore", "minmax"))
+    p.add_argument("ticker")
+    p.add_argument("--period", type=int, default=12, help="EMA period (default 12)")
+    p.add_argument("--start", help="first date (YYYY-MM-DD)")
+    p.add_argument("--end", help="last date (YYYY-MM-DD)")
+    p.add_argument("--prices", default=PRICES, help="price store folder")
+    p.add_argument("--plot", help="also save a PNG here")
+    p.set_defaults(run=cmd_indicator)
+
+    p = add("simulate", help="one simulated daily price path")
+    p.add_argument("price", type=float)
+    p.add_argument("--days", type=int, default=30)
+    p.add_argument("--max-pct", type=float, default=2.0, help="largest daily move in %% (default 2)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--plot", help="also save a PNG here")
+    p.set_defaults(run=cmd_simulate)
+
+    p = add("risk", help="Monte Carlo VaR / expected shortfall of the portfolio")
+    p.add_argument("file", nargs="?", default=PORTFOLIO)
+    p.add_argument("--days", type=int, default=30)
+    p.add_argument("--paths", type=int, default=10_000)
+    p.add_argument("--model", choices=("uniform", "gbm"), default="uniform")
+    p.add_argument("--drift", type=float, default=0.0, help="annual drift (gbm)")
+    p.add_argument("--volatility", type=float, default=0.2, help="annual volatility (gbm)")
+    p.add_argument("--level", type=float, default=0.95)
+    p.add_argument("--seed", type=int)
+    p.add_argument("--plot", help="also save a fan chart PNG here")
+    p.set_defaults(run=cmd_risk)
+
+    p = add("bench-startup", help="time interpreter startup for the CLI")
+    p.add_argument("--runs", type=int, default=10)
+    p.set_defaults(run=cmd_bench_startup)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.failed = False
+    try:
+        rows = args.run(args)
+    except (ValueError, KeyError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            _write(rows, args.format, out)
+    else:
+        _write(rows, args.format, sys.stdout)
+    if args.metrics:
+        from logic.metrics import metrics
+        metrics.export(args.metrics)
+    return 1 if args.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
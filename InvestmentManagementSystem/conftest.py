@@ -0,0 +1 @@
+# Lets pytest import the app's packages (logic, gui) from the tests folder.
@@ -1,15 +1,23 @@
 # gui/interface.py
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-import random
+from tkinter import ttk, messagebox, filedialog
 from logic.data_handler import Portfolio
-from logic.algorithms import ema  # EMA algorithm
-from logic.algorithms import z_score_normalisation
-from logic.algorithms import recursive_min_max  # import recursive min/max
+from logic.snapshot import snapshot_is_current
+from logic.prices import PriceStore  # imported daily closes, per ticker and year
+from logic.valuation import Valuation  # mark-to-market, revalues only ticked tickers
+from gui.virtual_table import VirtualTable  # draws only the visible holdings
+from logic.tasks import TaskExecutor  # runs the computations below off the Tk thread
+from logic.jobs import simulate_prices, ema_series, z_scores, min_max  # chunked algorithms
+from logic.memo import cache as memo_cache, fingerprint, MISS  # repeat overlays skip the job
+from logic.metrics import timed  # redraw timings; IMS_METRICS_FILE=path exports them on exit
+from logic.montecarlo import holdings, portfolio_paths, percentile_bands, risk_summary
+from logic.pipeline import pipeline, simulated, with_ema, with_min_max, run, Summary, Downsampler
+from datetime import datetime, timedelta
 
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from gui.plotting import FastPlot  # decimated series, blitted overlays
 
   
 class InvestmentGUI:
@@ -20,11 +28,24 @@ class InvestmentGUI:
 
         # backend
         self.portfolio = Portfolio()
-        self.portfolio.load_csv()  # load saved data if any
+        from_snapshot = snapshot_is_current("data/investments.snap", "data/investments.csv")
+        if from_snapshot:
+            try:
+                self.portfolio.load_snapshot()  # binary snapshot, no CSV parsing
+                load_errors = []
+            except (OSError, ValueError):
+                from_snapshot = False  # corrupt or truncated: rebuild from the CSV below
+        if not from_snapshot:
+            load_errors = self.portfolio.load_csv_bulk()  # load saved data if any, skipping bad rows
+        self.portfolio.open_journal(replay=from_snapshot)  # recover edits from a crashed session
 
         # keep last plotted series for overlays
         self.last_dates = None      # cache dates from last simulation/plot
         self.last_prices = None     # cache prices from last simulation/plot
+        self.last_fp = None         # (series, memo fingerprint), see series_fingerprint
+        self.tasks = TaskExecutor(workers=2)  # results come back through poll_tasks
+        self.prices = PriceStore("data/prices")
+        self.valuation = Valuation(self.portfolio)  # follows the portfolio; prices come from set_latest_prices
 
         # layout weights
         self.root.columnconfigure(0, weight=3)
@@ -37,32 +58,53 @@ class InvestmentGUI:
         self.frame_investment.grid(row=0, column=0, padx=15, pady=15, sticky="nsew")
         for c in range(4):
             self.frame_investment.columnconfigure(c, weight=1)
-        self.frame_investment.rowconfigure(0, weight=1)
-
+        self.frame_investment.rowconfigure(1, weight=1)
+
+        # filter bar: applied by the portfolio's indexes, not by the widget
+        bar = ttk.Frame(self.frame_investment)
+        bar.grid(row=0, column=0, columnspan=4, sticky="w", padx=5)
+        ttk.Label(bar, text="Filter ticker:").grid(row=0, column=0, padx=(0, 6))
+        self.entry_filter = ttk.Entry(bar, width=10)
+        self.entry_filter.grid(row=0, column=1, padx=(0, 10))
+        self.entry_filter.bind("<Return>", lambda e: self.apply_filter())
+        self.combo_filter_type = ttk.Combobox(bar, values=["All", "Stock", "ETF", "Crypto", "Bond", "Other"],
+                                              state="readonly", width=8)
+        self.combo_filter_type.set("All")
+        self.combo_filter_type.grid(row=0, column=2, padx=(0, 10))
+        self.combo_filter_type.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        ttk.Button(bar, text="Apply", command=self.apply_filter).grid(row=0, column=3, padx=5)
+        ttk.Button(bar, text="Show All", command=self.clear_filter).grid(row=0, column=4, padx=5)
+
+        # holdings: only the visible rows exist as Treeview items
         columns = ("Ticker", "Quantity", "Price", "Date", "Value")
-        self.tree = ttk.Treeview(self.frame_investment, columns=columns, show="headings", height=14)
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120, anchor="center")
-        self.tree.grid(row=0, column=0, columnspan=4, padx=5, pady=10, sticky="nsew")
+        self.table = VirtualTable(self.frame_investment, self.portfolio, columns, self.row_values,
+                                  sort_fields={"Ticker": "ticker", "Quantity": "quantity", "Price": "price",
+                                               "Date": "date", "Value": "value"})
+        self.table.grid(row=1, column=0, columnspan=4, padx=5, pady=10, sticky="nsew")
 
         self.btn_add = ttk.Button(self.frame_investment, text="Add", width=12, command=self.focus_add_form)
-        self.btn_add.grid(row=1, column=0, padx=5, pady=5)
+        self.btn_add.grid(row=2, column=0, padx=5, pady=5)
 
         self.btn_edit = ttk.Button(self.frame_investment, text="Edit", width=12, command=self.open_edit_window)
-        self.btn_edit.grid(row=1, column=1, padx=5, pady=5)
+        self.btn_edit.grid(row=2, column=1, padx=5, pady=5)
 
         self.btn_delete = ttk.Button(self.frame_investment, text="Delete", width=12, command=self.delete_selected)
-        self.btn_delete.grid(row=1, column=2, padx=5, pady=5)
+        self.btn_delete.grid(row=2, column=2, padx=5, pady=5)
 
         self.btn_simulate = ttk.Button(self.frame_investment, text="Simulate Graph", width=12, command=self.simulate_and_plot)
-        self.btn_simulate.grid(row=1, column=3, padx=5, pady=5)
+        self.btn_simulate.grid(row=2, column=3, padx=5, pady=5)
 
         self.label_value = ttk.Label(self.frame_investment, text="Total Portfolio Value: £0.00")
-        self.label_value.grid(row=2, column=0, columnspan=2, sticky="w", pady=5)
+        self.label_value.grid(row=3, column=0, columnspan=2, sticky="w", pady=5)
 
         self.label_profit = ttk.Label(self.frame_investment, text="Total Portfolio Profit: £0.00")
-        self.label_profit.grid(row=3, column=0, columnspan=2, sticky="w", pady=5)
+        self.label_profit.grid(row=4, column=0, columnspan=2, sticky="w", pady=5)
+
+        self.btn_import = ttk.Button(self.frame_investment, text="Import Prices", width=12, command=self.import_prices)
+        self.btn_import.grid(row=3, column=2, padx=5, pady=5)
+
+        self.btn_history = ttk.Button(self.frame_investment, text="Price History", width=12, command=self.show_history)
+        self.btn_history.grid(row=3, column=3, padx=5, pady=5)
 
         #  Add Investment 
         self.frame_add = ttk.LabelFrame(self.root, text="Add Investment", padding=10)
@@ -115,36 +157,78 @@ class InvestmentGUI:
         ttk.Button(ctrl, text="Clear Plot", command=self.clear_plot).grid(row=0, column=3, padx=5)
         ttk.Button(ctrl, text="Normalise (Z-Score)", command=self.normalise_prices).grid(row=0, column=4, padx=5)  
         ttk.Button(ctrl, text="Find Min/Max (Recursive)", command=self.find_min_max_recursive).grid(row=0, column=5, padx=5)  # button to run recursive min/max
+        ttk.Button(ctrl, text="Portfolio Risk", command=self.simulate_risk).grid(row=0, column=6, padx=5)  # Monte Carlo fan chart
+        ttk.Button(ctrl, text="10y Minute Sim", command=self.simulate_long).grid(row=0, column=7, padx=5)  # streamed, never held whole
+        self.progress = ttk.Progressbar(ctrl, length=120, maximum=1.0)  # progress of the running job
+        self.progress.grid(row=0, column=8, padx=(10, 0))
 
 
         # Matplotlib fig/canvas
         self.figure = Figure(figsize=(8, 3), dpi=100)
         self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.frame_graph)
+        self.canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew")
+        self.fastplot = FastPlot(self.ax, self.canvas)  # only pixel-width points reach Matplotlib
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self.frame_graph, pack_toolbar=False)  # zoom re-decimates
+        self.toolbar.grid(row=2, column=0, sticky="w")
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Price (£)")
         self.ax.grid(True, alpha=0.3)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.frame_graph)
-        self.canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew")
 
         # initial table/totals
-        self.populate_from_portfolio()
+        self.table.refresh()
         self.refresh_totals()
+        self.portfolio.subscribe(self.on_portfolio_change)  # table/totals follow every change
+        if load_errors:
+            shown = "\n".join(f"Line {e.line}: {e.message}" for e in load_errors[:10])
+            messagebox.showwarning("Load Warning", f"Skipped {len(load_errors)} bad value(s) in the CSV:\n{shown}")
 
         # save on close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.sync_journal()  # group commit even when idle
+        self.poll_tasks()
+        self.load_latest_prices()
 
     # table helpers 
-    def populate_from_portfolio(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for inv in self.portfolio.items:
-            value = inv.price * inv.quantity
-            self.tree.insert("", "end", values=(inv.ticker, inv.quantity, inv.price, inv.date, f"{value:.2f}"))
+    def row_values(self, inv):
+        value = inv.price * inv.quantity
+        return (inv.ticker, inv.quantity, inv.price, inv.date, f"{value:.2f}")
+
+    def on_portfolio_change(self, change):
+        """One call per mutation or per Portfolio.batch(): redraw the visible rows, then totals once."""
+        self.table.on_change(change)
+        self.refresh_totals()
+
+    def apply_filter(self):
+        asset_type = self.combo_filter_type.get()
+        self.table.set_filter(ticker=self.entry_filter.get().strip() or None,
+                              asset_type=None if asset_type == "All" else asset_type)
+
+    def clear_filter(self):
+        self.entry_filter.delete(0, tk.END)
+        self.combo_filter_type.set("All")
+        self.table.set_filter()
 
+    @timed()
     def refresh_totals(self):
-        total_value = sum(inv.price * inv.quantity for inv in self.portfolio.items)
-        self.label_value.config(text=f"Total Portfolio Value: £{total_value:.2f}")
-        self.label_profit.config(text="Total Portfolio Profit: £0.00")  # stays 0 until current prices available
+        if not self.valuation.prices:
+            total_value = self.portfolio.total_value()  # running sum, O(1)
+            self.label_value.config(text=f"Total Portfolio Value: £{total_value:.2f}")
+            self.label_profit.config(text="Total Portfolio Profit: £0.00 (no prices imported)")
+            return
+        summary = self.valuation.summary()  # unpriced tickers count at cost
+        unpriced = f", {len(summary['unpriced'])} ticker(s) unpriced" if summary["unpriced"] else ""
+        self.label_value.config(text=f"Total Portfolio Value: £{summary['value']:.2f}")
+        self.label_profit.config(text=f"Total Portfolio Profit: £{summary['pnl']:.2f} (at last close{unpriced})")
+
+    def load_latest_prices(self):
+        self.run_task("prices", self.prices.latest_prices, on_done=self.set_latest_prices,
+                      on_error=lambda e: messagebox.showerror("Price Error", str(e)))
+
+    def set_latest_prices(self, prices):
+        """Also the entry point for live ticks: only the given tickers are revalued."""
+        self.valuation.update(prices)
+        self.refresh_totals()
 
     def clear_form(self):
         self.entry_ticker.delete(0, tk.END)
@@ -165,31 +249,24 @@ class InvestmentGUI:
         price = self.entry_price.get()
         date = self.entry_date.get()
         try:
-            inv = self.portfolio.add_investment(ticker, price, qty, date)
-            value = inv.price * inv.quantity
-            self.tree.insert("", "end", values=(inv.ticker, inv.quantity, inv.price, inv.date, f"{value:.2f}"))
+            self.portfolio.add_investment(ticker, price, qty, date)  # table updates via on_portfolio_change
             self.clear_form()
-            self.refresh_totals()
         except ValueError as e:
             messagebox.showerror("Input Error", str(e))
 
     def delete_selected(self):
-        sel = self.tree.selection()
-        if not sel:
+        inv_id = self.table.selected_id()
+        if inv_id is None:
             messagebox.showwarning("Warning", "Select an investment to delete.")
             return
-        index = self.tree.index(sel[0])
-        self.portfolio.delete_investment(index)
-        self.tree.delete(sel[0])
-        self.refresh_totals()
+        self.portfolio.delete_by_id(inv_id)
 
     def open_edit_window(self):
-        sel = self.tree.selection()
-        if not sel:
+        inv_id = self.table.selected_id()
+        if inv_id is None:
             messagebox.showwarning("Warning", "Select an investment to edit.")
             return
-        index = self.tree.index(sel[0])
-        inv = self.portfolio.items[index]
+        inv = self.portfolio.get(inv_id)
 
         win = tk.Toplevel(self.root)
         win.title("Edit Investment")
@@ -208,50 +285,165 @@ class InvestmentGUI:
 
         def save_changes():
             try:
-                inv.ticker = e_ticker.get().upper()
-                inv.date = e_date.get()
-                self.portfolio.edit_investment(index, new_price=e_price.get(), new_quantity=e_qty.get())
-                value = inv.price * inv.quantity
-                self.tree.item(self.tree.get_children()[index],
-                               values=(inv.ticker, inv.quantity, inv.price, inv.date, f"{value:.2f}"))
-                self.refresh_totals()
+                self.portfolio.edit_by_id(inv_id, new_price=e_price.get(), new_quantity=e_qty.get(),
+                                          new_ticker=e_ticker.get(), new_date=e_date.get())
                 win.destroy()
-            except (ValueError, IndexError) as e:
+            except (ValueError, KeyError) as e:
                 messagebox.showerror("Edit Error", str(e))
 
         ttk.Button(win, text="Save", command=save_changes).grid(row=4, column=0, columnspan=2, pady=12)
 
     #  simulated series + plotting 
     def simulate_and_plot(self):
-        sel = self.tree.selection()
-        if not sel:
+        inv_id = self.table.selected_id()
+        if inv_id is None:
             messagebox.showwarning("Warning", "Select an investment to simulate.")
             return
-        index = self.tree.index(sel[0])
-        inv = self.portfolio.items[index]
+        inv = self.portfolio.get(inv_id)
+        ticker = inv.ticker
+        self.run_task("series", self.generate_price_series, inv.price, 30, 2.0,
+                      on_done=lambda series: self.plot_series(ticker, *series),
+                      on_error=lambda e: messagebox.showerror("Simulation Error", str(e)))
+
+    def show_history(self):
+        """Plot the stored closes of the selected ticker (see Import Prices)."""
+        inv_id = self.table.selected_id()
+        if inv_id is None:
+            messagebox.showwarning("Warning", "Select an investment to show its price history.")
+            return
+        ticker = self.portfolio.get(inv_id).ticker
+        self.run_task("series", self.prices.series, ticker,
+                      on_done=lambda result: self.plot_history(ticker, *result),
+                      on_error=lambda e: messagebox.showerror("Price History Error", str(e)))
+
+    def plot_history(self, ticker, dates, closes):
+        if not len(dates):
+            messagebox.showinfo("Info", f"No price history for {ticker}. Use Import Prices first.")
+            return
+        self.plot_series(ticker, dates.tolist(), closes.tolist(), label=f"{ticker} (Close)")
+
+    def import_prices(self):
+        """Import daily price CSVs (date + close columns) into the price store in the background."""
+        paths = filedialog.askopenfilenames(title="Import price history",
+                                            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not paths:
+            return
 
-        dates, prices = self.generate_price_series(start_price=inv.price, days=30, max_pct_change=2.0)
+        def job():
+            written, errors = {}, []
+            for path in paths:
+                counts, bad = self.prices.import_csv(path)
+                written.update(counts)
+                errors.extend((path, e) for e in bad)
+            return written, errors, self.prices.latest_prices()
+
+        self.run_task("import", job, on_done=lambda result: self.imported_prices(*result),
+                      on_error=lambda e: messagebox.showerror("Import Error", str(e)))
+
+    def imported_prices(self, written, errors, latest):
+        self.set_latest_prices(latest)
+        text = "\n".join(f"{t}: {n:,} day(s)" for t, n in sorted(written.items())) or "Nothing imported."
+        if errors:
+            text += f"\n\nSkipped {len(errors)} bad value(s):\n" + "\n".join(
+                f"{os.path.basename(path)} line {e.line}: {e.message}" for path, e in errors[:10])
+        messagebox.showinfo("Prices Imported", text)
+
+    @timed()
+    def plot_series(self, ticker, dates, prices, label=None):
+        self.tasks.cancel("ema", "zscore", "minmax")  # they were for the old series
         self.last_dates, self.last_prices = dates, prices  # cache for overlays
 
-        self.ax.clear()
-        self.ax.plot(dates, prices, linewidth=2, label=f"{inv.ticker} (Simulated)")
+        self.fastplot.reset()
+        self.fastplot.line(dates, prices, linewidth=2, label=label or f"{ticker} (Simulated)")
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Price (£)")
         self.ax.grid(True, alpha=0.3)
-        self.ax.legend(loc="upper left")
+        self.fastplot.legend(loc="upper left")
         self.figure.autofmt_xdate()
         self.canvas.draw()
     
 
-    def generate_price_series(self, start_price, days=30, max_pct_change=2.0):
+    def generate_price_series(self, start_price, days=30, max_pct_change=2.0, progress=None):
+        return simulate_prices(start_price, days, max_pct_change, progress)  # see logic/jobs.py
+
+    def simulate_risk(self, days=30, paths=10_000):
+        """Monte Carlo the whole portfolio and draw percentile bands of its value."""
+        try:
+            _, start, quantities = holdings(self.portfolio)  # read here, on the Tk thread
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+
+        def job(progress=None):
+            values = portfolio_paths(start, quantities, days, paths, progress=progress)
+            return percentile_bands(values), risk_summary(values)
+
+        self.run_task("series", job, on_done=lambda result: self.plot_fan(*result),
+                      on_error=lambda e: messagebox.showerror("Simulation Error", str(e)))
+
+    @timed()
+    def plot_fan(self, bands, risk):
+        self.tasks.cancel("ema", "zscore", "minmax")  # they were for the old series
         base = datetime.today().date()
-        dates = [base - timedelta(days=(days - 1 - i)) for i in range(days)]  # ascending dates
-        prices = [float(start_price)]
-        for _ in range(1, days):
-            pct = random.uniform(-max_pct_change, max_pct_change)  # random daily change
-            next_p = prices[-1] * (1 + pct / 100.0)
-            prices.append(round(max(next_p, 0.01), 2))  # clamp to positive, 2dp
-        return dates, prices
+        dates = [base + timedelta(days=i) for i in range(len(bands[50]))]  # forward from today
+        self.last_dates, self.last_prices = dates, [round(p, 2) for p in bands[50]]  # overlays use the median
+
+        self.fastplot.reset()
+        self.ax.fill_between(dates, bands[5], bands[95], alpha=0.2, label="5-95%")
+        self.ax.fill_between(dates, bands[25], bands[75], alpha=0.35, label="25-75%")
+        self.fastplot.line(dates, bands[50], linewidth=2, label="Median")
+        self.ax.set_title(f"{int(risk['level'] * 100)}% VaR £{risk['var']:.2f}   "
+                          f"Expected shortfall £{risk['expected_shortfall']:.2f}", fontsize=9)
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Portfolio value (£)")
+        self.ax.grid(True, alpha=0.3)
+        self.fastplot.legend(loc="upper left")
+        self.figure.autofmt_xdate()
+        self.canvas.draw()
+
+    def simulate_long(self, years=10):
+        """Stream a minute-by-minute simulation through EMA and min/max; only plot points are kept."""
+        inv_id = self.table.selected_id()
+        if inv_id is None:
+            messagebox.showwarning("Warning", "Select an investment to simulate.")
+            return
+        try:
+            period = int(self.entry_ema_period.get())
+            if period <= 0:
+                raise ValueError("EMA period must be greater than 0.")
+        except ValueError as e:
+            messagebox.showerror("EMA Error", str(e))
+            return
+        inv = self.portfolio.get(inv_id)
+        ticker, start_price = inv.ticker, inv.price
+        steps = years * 365 * 24 * 60
+        pixels = max(self.canvas.get_tk_widget().winfo_width(), 200)
+
+        def job(progress=None):
+            chunks = pipeline(simulated(start_price, steps, max_pct_change=0.05), with_ema(period), with_min_max())
+            return run(chunks, Summary(), Downsampler(2 * pixels), progress=progress)  # ~2 points per pixel
+
+        self.run_task("series", job, on_done=lambda result: self.plot_stream(ticker, period, *result),
+                      on_error=lambda e: messagebox.showerror("Simulation Error", str(e)))
+
+    @timed()
+    def plot_stream(self, ticker, period, summary, points):
+        """Plotting adapter for a pipeline: draws the downsampled stream, not the full series."""
+        self.tasks.cancel("ema", "zscore", "minmax")  # they were for the old series
+        dates = points["time"].astype("datetime64[s]").tolist()
+        self.last_dates, self.last_prices = dates, points["price"].tolist()  # overlays work on plot points
+
+        self.fastplot.reset()
+        self.fastplot.line(dates, points["price"], linewidth=1, label=f"{ticker} (Simulated, {summary['count']:,} min)")
+        self.fastplot.line(dates, points["ema"], linewidth=1, label=f"EMA({period})")
+        self.ax.set_title(f"Low £{summary['min']:.2f} on {summary['min_time'][:10]}   "
+                          f"High £{summary['max']:.2f} on {summary['max_time'][:10]}", fontsize=9)
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Price (£)")
+        self.ax.grid(True, alpha=0.3)
+        self.fastplot.legend(loc="upper left")
+        self.figure.autofmt_xdate()
+        self.canvas.draw()
 
     def overlay_ema(self):
         if not self.last_prices or not self.last_dates:
@@ -261,37 +453,40 @@ class InvestmentGUI:
             period = int(self.entry_ema_period.get())
             if period <= 0:
                 raise ValueError("EMA period must be greater than 0.")
-            ema_vals = ema(self.last_prices, period)
         except ValueError as e:
             messagebox.showerror("EMA Error", str(e))
             return
+        self.run_task("ema", ema_series, self.last_prices, period, cache=True,
+                      on_done=lambda ema_vals: self.plot_ema(period, ema_vals),
+                      on_error=lambda e: messagebox.showerror("EMA Error", str(e)))
 
-        self.ax.plot(self.last_dates, ema_vals, linewidth=2, label=f"EMA({period})")
-        self.ax.legend(loc="upper left")
-        self.canvas.draw()
+    @timed()
+    def plot_ema(self, period, ema_vals):
+        self.fastplot.line(self.last_dates, ema_vals, overlay=True, linewidth=2, label=f"EMA({period})")
+        self.fastplot.legend(loc="upper left")
+        self.fastplot.blit()  # only the new line and legend are drawn
 
     def normalise_prices(self):
         if not self.last_prices or not self.last_dates:
             messagebox.showwarning("Warning", "Simulate or plot a price series first.")
             return
-        try:
-            z_vals = z_score_normalisation(self.last_prices)
-        except Exception as e:
-            messagebox.showerror("Normalisation Error", str(e))
-            return
+        self.run_task("zscore", z_scores, self.last_prices, cache=True, on_done=self.plot_z_scores,
+                      on_error=lambda e: messagebox.showerror("Normalisation Error", str(e)))
 
-        self.ax.clear()
-        self.ax.plot(self.last_dates, z_vals, linewidth=2, label="Z-Score Normalised")
+    @timed()
+    def plot_z_scores(self, z_vals):
+        self.fastplot.reset()
+        self.fastplot.line(self.last_dates, z_vals, linewidth=2, label="Z-Score Normalised")
         self.ax.axhline(0, linestyle="--", linewidth=1)
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Z-score")
         self.ax.grid(True, alpha=0.3)
-        self.ax.legend(loc="upper left")
+        self.fastplot.legend(loc="upper left")
         self.figure.autofmt_xdate()
         self.canvas.draw()
 
     def clear_plot(self):
-        self.ax.clear()
+        self.fastplot.reset()
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Price (£)")
         self.ax.grid(True, alpha=0.3)
@@ -303,18 +498,20 @@ class InvestmentGUI:
             messagebox.showwarning("Warning", "Please simulate prices first.")
             return
 
+        self.run_task("minmax", min_max, self.last_prices, cache=True, on_done=self.mark_min_max,
+                      on_error=lambda e: messagebox.showerror("Error", str(e)))
+
+    def mark_min_max(self, result):
         try:
-            min_val, max_val = recursive_min_max(self.last_prices)
-            min_idx = self.last_prices.index(min_val)
-            max_idx = self.last_prices.index(max_val)
+            min_val, max_val, min_idx, max_idx = result  # first occurrences, as list.index gave
             min_date = self.last_dates[min_idx]
             max_date = self.last_dates[max_idx]
 
             # mark min (red) and max (green) points on current plot
-            self.ax.plot(min_date, min_val, "ro", label="Min (Recursive)")
-            self.ax.plot(max_date, max_val, "go", label="Max (Recursive)")
-            self.ax.legend(loc="upper left")
-            self.canvas.draw()
+            self.fastplot.markers([min_date], [min_val], "ro", label="Min (Recursive)")
+            self.fastplot.markers([max_date], [max_val], "go", label="Max (Recursive)")
+            self.fastplot.legend(loc="upper left")
+            self.fastplot.blit()
 
             messagebox.showinfo(
                 "Recursive Min/Max Found",
@@ -325,11 +522,55 @@ class InvestmentGUI:
             messagebox.showerror("Error", str(e))
     # -- NEW --
 
+    #  background jobs
+    def run_task(self, name, fn, *args, on_done, on_error=None, cache=False):
+        """Run fn in the pool; clicking again replaces a job of the same name still running.
+
+        cache=True looks fn(series, *params) up in the memo cache first and
+        stores the result when the job finishes (deterministic jobs only).
+        """
+        self.progress["value"] = 0
+        if cache:
+            series, params = args[0], args[1:]
+            fp = self.series_fingerprint(series)
+            value = memo_cache.get(fn, series, params, fp)
+            if value is not MISS:
+                self.tasks.cancel(name)  # an older click must not overwrite this
+                on_done(value)
+                return
+            done = on_done
+
+            def on_done(value):
+                done(memo_cache.put(fn, series, value, params, fp))  # read-only, as a hit would be
+        self.tasks.submit(name, fn, *args, on_done=on_done, on_error=on_error,
+                          on_progress=lambda fraction: self.progress.configure(value=fraction))
+
+    def series_fingerprint(self, series):
+        """Memo fingerprint, hashed once per series object (last_prices is replaced, never edited)."""
+        if self.last_fp is None or self.last_fp[0] is not series:
+            self.last_fp = (series, fingerprint(series))
+        return self.last_fp[1]
+
+    def poll_tasks(self):
+        try:
+            self.tasks.poll()  # callbacks run here, on the Tk thread
+            if not self.tasks.busy():
+                self.progress["value"] = 0
+        finally:
+            self.root.after(50, self.poll_tasks)  # keep polling whatever happened
+
+    def sync_journal(self):
+        self.portfolio.sync_journal()
+        self.root.after(1000, self.sync_journal)
+
     #  save on close 
     def on_close(self):
         try:
             self.portfolio.save_csv()
+            self.portfolio.compact()  # snapshot written after the CSV so it counts as current
+            self.portfolio.close_journal()
         finally:
+            self.tasks.shutdown(wait=False)
             self.root.destroy()
 
 
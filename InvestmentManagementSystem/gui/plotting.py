@@ -0,0 +1,107 @@
+# gui/plotting.py
+# Fast redraws for the Performance plot.
+#
+# Matplotlib only ever gets the points of a series that can be seen at
+# the current pixel width (logic/decimate.py); the full arrays stay here
+# and are re-decimated whenever the x range changes (toolbar zoom/pan).
+# Overlays, markers and the legend are "animated" artists: after each
+# full draw the background is cached, and adding one restores the cached
+# background and draws just those artists (blitting) instead of
+# re-rendering the whole figure.
+import numpy as np
+from matplotlib import dates as mdates
+
+from logic.decimate import decimate
+from logic.metrics import timed
+
+
+class FastPlot:
+    def __init__(self, ax, canvas, method="min_max"):
+        self.ax = ax
+        self.canvas = canvas
+        self.method = method      # "min_max" keeps spikes, "lttb" keeps shape
+        self._background = None   # pixels of the last full draw, without animated artists
+        canvas.mpl_connect("draw_event", self._on_draw)
+        self.reset()
+
+    def reset(self):
+        """ax.clear() and forget every series (clearing an Axes also drops its callbacks)."""
+        self.ax.clear()
+        self._series = []         # (Line2D, x as given, x as numbers, y)
+        self._animated = []
+        self._legend = None
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim)
+
+    #  artists
+    def line(self, x, y, overlay=False, **kwargs):
+        """Plot a full series decimated to the axes width.
+
+        overlay=True makes it an animated artist that keeps the current
+        limits and is shown by blit() rather than a full draw.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=np.float64)
+        xs = x.astype(np.float64) if x.dtype.kind in "fiu" else mdates.date2num(x)
+        idx = decimate(xs, y, self._pixels(), self.method, self._view() if overlay else None)
+        if overlay:
+            kwargs.update(animated=True, scalex=False, scaley=False)
+        (artist,) = self.ax.plot(x[idx], y[idx], **kwargs)
+        self._series.append((artist, x, xs, y))
+        if overlay:
+            self._animated.append(artist)
+        return artist
+
+    def markers(self, x, y, fmt, **kwargs):
+        """A few points (e.g. min/max) as an animated overlay."""
+        (artist,) = self.ax.plot(x, y, fmt, animated=True, scalex=False, scaley=False, **kwargs)
+        self._animated.append(artist)
+        return artist
+
+    def legend(self, **kwargs):
+        """(Re)build the legend; it is animated so overlays can update it without a full draw."""
+        if self._legend is not None:
+            self._animated.remove(self._legend)
+            self._legend.remove()
+        self._legend = self.ax.legend(**kwargs)
+        self._legend.set_animated(True)
+        self._animated.append(self._legend)
+        return self._legend
+
+    #  drawing
+    @timed()
+    def draw(self):
+        """Full redraw; call after the base series change."""
+        self.canvas.draw()
+
+    @timed()
+    def blit(self):
+        """Show animated artists over the cached background: cost grows with them, not the plot."""
+        if self._background is None:
+            self.draw()  # nothing cached yet
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def _on_draw(self, _event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()  # animated artists are skipped by a normal draw
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            self.ax.draw_artist(artist)
+
+    #  re-decimation
+    def _pixels(self):
+        return max(int(self.ax.bbox.width), 100)
+
+    def _view(self):
+        return self.ax.get_xlim()
+
+    @timed()
+    def _on_xlim(self, _ax):
+        """Zoom/pan: swap in the points for the new range; the pending draw shows them."""
+        view, pixels = self._view(), self._pixels()
+        for artist, x, xs, y in self._series:
+            idx = decimate(xs, y, pixels, self.method, view)
+            artist.set_data(x[idx], y[idx])
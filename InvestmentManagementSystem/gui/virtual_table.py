@@ -0,0 +1,181 @@
+# gui/virtual_table.py
+# Holdings table that only ever holds the rows on screen.
+#
+# The Treeview keeps a fixed pool of items (one per visible line) whose
+# values are swapped as the user scrolls, so drawing costs the same for
+# 50 lots or 5 million. The row order is an array of investment ids asked
+# from Portfolio.view_ids(), which does the sorting and filtering on the
+# columns; a few screens of row values around the window are cached.
+from tkinter import ttk
+
+import numpy as np
+
+from logic.metrics import timed, count
+
+
+class VirtualTable(ttk.Frame):
+    BUFFER = 40  # rows cached above and below the window
+
+    def __init__(self, master, portfolio, columns, row_values, sort_fields, height=14):
+        super().__init__(master)
+        self.portfolio = portfolio
+        self.row_values = row_values      # Investment -> tuple of cell values
+        self.sort_fields = sort_fields    # column heading -> field for Portfolio.view_ids
+        self.sort_by = None
+        self.descending = False
+        self.filters = {}                 # ticker / asset_type / start / end
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.top = 0                      # position of the first visible row in self.ids
+        self.visible = height
+        self.selected = None              # selected investment id, kept while scrolled away
+        self._cache = {}                  # id -> row values around the window
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height, selectmode="browse")
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort(c))
+            self.tree.column(col, width=120, anchor="center")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self._set_pool(height)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self._scroll(-1, "units"))  # X11 wheel
+        self.tree.bind("<Button-5>", lambda e: self._scroll(1, "units"))
+        self.tree.bind("<Up>", lambda e: self._move(-1))
+        self.tree.bind("<Down>", lambda e: self._move(1))
+        self.tree.bind("<Prior>", lambda e: self._move(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._move(self.visible))
+        self.tree.bind("<Home>", lambda e: self._move(-len(self.ids)))
+        self.tree.bind("<End>", lambda e: self._move(len(self.ids)))
+
+    #  data
+    @timed()
+    def refresh(self):
+        """Ask the portfolio for the current order/filter, then redraw."""
+        self.ids = self.portfolio.view_ids(self.sort_by, self.descending, **self.filters)
+        self._cache.clear()
+        if self.selected is not None and not (self.ids == self.selected).any():
+            self.selected = None  # deleted or filtered out
+        self.render()
+
+    def on_change(self, change):
+        """Follow a Portfolio Change: re-query only when the order or the set of rows may differ."""
+        self._cache.clear()
+        if change.reloaded or change.deleted or ((change.added or change.edited) and (self.sort_by or self.filters)):
+            self.refresh()
+            return
+        if change.added:  # unsorted and unfiltered: new lots simply go on the end
+            self.ids = np.concatenate([self.ids, np.asarray(change.added, dtype=np.int64)])
+        self.render()
+
+    def sort(self, column):
+        """Heading click: sort by that column, a second click reverses it."""
+        field = self.sort_fields[column]
+        self.descending = not self.descending if self.sort_by == field else False
+        self.sort_by = field
+        for col, f in self.sort_fields.items():
+            arrow = (" ▼" if self.descending else " ▲") if f == field else ""
+            self.tree.heading(col, text=col + arrow)
+        self.top = 0
+        self.refresh()
+
+    def set_filter(self, **filters):
+        """Show only lots matching filters (same keywords as Portfolio.find); none shows all."""
+        self.filters = {k: v for k, v in filters.items() if v}
+        self.top = 0
+        self.refresh()
+
+    def selected_id(self):
+        return self.selected
+
+    #  drawing, O(visible rows)
+    @timed()
+    def render(self):
+        total = len(self.ids)
+        self.top = max(0, min(self.top, total - self.visible))
+        window = self.ids[self.top:self.top + self.visible].tolist()
+        self._fill_cache()
+
+        slots = self.tree.get_children()
+        for slot, inv_id in zip(slots, window):
+            self.tree.item(slot, values=self._cache[inv_id])
+        for slot in slots[len(window):]:
+            self.tree.item(slot, values=())  # past the last row
+        self.tree.selection_set([slots[window.index(self.selected)]] if self.selected in window else [])
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _fill_cache(self):
+        """Keep row values for the window plus BUFFER rows each side; drop the rest."""
+        lo = max(0, self.top - self.BUFFER)
+        around = self.ids[lo:self.top + self.visible + self.BUFFER].tolist()
+        cache = self._cache
+        self._cache = {}
+        fetched = 0
+        for inv_id in around:
+            values = cache.get(inv_id)
+            if values is None:
+                values = self.row_values(self.portfolio.get(inv_id))
+                fetched += 1
+            self._cache[inv_id] = values
+        count("gui.table.rows_fetched", fetched)  # against calls of render: how well the cache works
+
+    def _set_pool(self, size):
+        """Grow or shrink the fixed set of Treeview items to size."""
+        slots = self.tree.get_children()
+        for i in range(len(slots), size):
+            self.tree.insert("", "end", iid=f"slot{i}")
+        if len(slots) > size:
+            self.tree.delete(*slots[size:])
+        self.visible = size  # the widget's own height is left alone, so resizing can't feed back
+
+    #  scrolling
+    def yview(self, *args):
+        """Scrollbar callback: ("moveto", fraction) or ("scroll", n, "units"/"pages")."""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.ids))
+            self.render()
+        elif args[0] == "scroll":
+            self._scroll(int(args[1]), args[2])
+
+    def _scroll(self, n, what):
+        self.top += n * (self.visible if what == "pages" else 3)
+        self.render()
+        return "break"  # stop the Treeview scrolling its own (fixed) items
+
+    def _move(self, delta):
+        """Keyboard: move the selection, scrolling the window to keep it in view."""
+        if not len(self.ids):
+            return "break"
+        pos = int(np.flatnonzero(self.ids == self.selected)[0]) if self.selected in self.ids else self.top - 1
+        pos = max(0, min(pos + delta, len(self.ids) - 1))
+        self.selected = int(self.ids[pos])
+        if pos < self.top:
+            self.top = pos
+        elif pos >= self.top + self.visible:
+            self.top = pos - self.visible + 1
+        self.render()
+        return "break"
+
+    def _on_select(self, _event):
+        sel = self.tree.selection()
+        if sel:  # an empty selection just means the selected row scrolled away
+            pos = self.top + self.tree.index(sel[0])
+            if pos < len(self.ids):
+                self.selected = int(self.ids[pos])
+
+    def _on_resize(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        rows = max(1, (event.height - 20) // row_height)  # minus the heading
+        if rows != self.visible:
+            self._set_pool(rows)
+            self.render()
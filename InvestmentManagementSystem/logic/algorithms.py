@@ -1,5 +1,9 @@
 # logic/algorithms.py
+from collections import deque
 
+from logic.metrics import timed  # call counts and latency histograms, see logic/metrics.py
+
+@timed()
 def ema(prices, period):
     """Calculate Exponential Moving Average over a list of prices."""
     if not prices or len(prices) < 2:
@@ -15,6 +19,7 @@ def ema(prices, period):
         ema_vals.append(round(ema_prev, 2))  # keep 2dp
     return ema_vals
 
+@timed()
 def z_score_normalisation(values):
     """Return a list of Z-scores for a list of numeric values."""
     if not values:
@@ -27,15 +32,217 @@ def z_score_normalisation(values):
     return [(x - mean) / std_dev for x in values]
 
 #  Recursive Min/Max 
+@timed()
 def recursive_min_max(prices):
 
     if not prices:
         raise ValueError("No prices provided for recursive min/max.")
-    if len(prices) == 1:
-        return prices[0], prices[0]
+    return _recursive_min_max(prices, 0, len(prices))  # recurse untimed: one timing per call, not per split
+
+
+def _recursive_min_max(prices, lo, hi):
+    # min/max of prices[lo:hi] (never empty), by index so no slices are copied
+    if hi - lo == 1:
+        return prices[lo], prices[lo]
 
-    mid = len(prices) // 2
-    left_min, left_max = recursive_min_max(prices[:mid])
-    right_min, right_max = recursive_min_max(prices[mid:])
+    mid = (lo + hi) // 2
+    left_min, left_max = _recursive_min_max(prices, lo, mid)
+    right_min, right_max = _recursive_min_max(prices, mid, hi)
     return min(left_min, right_min), max(left_max, right_max)
 
+
+#  Sliding-window versions 
+# The first window - 1 results use the bars available so far.
+
+@timed()
+def rolling_min_max(prices, window):
+    """Min and max of the last `window` prices at every bar (monotonic deques)."""
+    if not prices:
+        raise ValueError("No prices provided for rolling min/max.")
+    window = int(window)
+    if window <= 0:
+        raise ValueError("Window must be greater than 0.")
+    lows, highs = deque(), deque()  # indexes with increasing / decreasing prices
+    mins, maxs = [], []
+    for i, p in enumerate(prices):
+        while lows and prices[lows[-1]] >= p:
+            lows.pop()  # can never be the minimum again
+        while highs and prices[highs[-1]] <= p:
+            highs.pop()
+        lows.append(i)
+        highs.append(i)
+        if lows[0] <= i - window:
+            lows.popleft()  # fell out of the window
+        if highs[0] <= i - window:
+            highs.popleft()
+        mins.append(prices[lows[0]])
+        maxs.append(prices[highs[0]])
+    return mins, maxs
+
+
+@timed()
+def rolling_z_score(values, window):
+    """Z-score of each value against the last `window` values (sliding Welford updates)."""
+    if not values:
+        raise ValueError("No data provided for normalisation.")
+    window = int(window)
+    if window <= 0:
+        raise ValueError("Window must be greater than 0.")
+    mean = m2 = 0.0  # m2: sum of squared deviations from mean, no big sums to cancel
+    z_vals = []
+    for i, x in enumerate(values):
+        x = float(x)
+        if i < window:
+            n = i + 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        else:
+            old = float(values[i - window])  # swap the value leaving the window for x
+            old_mean = mean
+            mean += (x - old) / n
+            m2 += (x - old) * (x - mean + old - old_mean)
+            if (i + 1) % window == 0:  # resync every window bars (amortised O(1)) so rounding can't drift
+                recent = [float(v) for v in values[i + 1 - window:i + 1]]
+                mean = sum(recent) / n
+                m2 = sum((v - mean) ** 2 for v in recent)
+        variance = max(m2 / n, 0.0)  # clamp rounding noise
+        std_dev = variance ** 0.5
+        z_vals.append(0 if std_dev == 0 else (x - mean) / std_dev)
+    return z_vals
+
+
+@timed()
+def ema_bank(prices, periods):
+    """EMAs for several periods in one pass; returns {period: ema list}."""
+    if not prices or len(prices) < 2:
+        raise ValueError("Not enough price data for EMA.")
+    periods = [int(p) for p in periods]
+    if any(p <= 0 for p in periods):
+        raise ValueError("EMA period must be greater than 0.")
+    ks = [2 / (p + 1) for p in periods]
+    prev = [float(prices[0])] * len(periods)  # seed every EMA with first price
+    out = [[] for _ in periods]
+    for p in prices:
+        p = float(p)
+        for j, k in enumerate(ks):
+            prev[j] = (p - prev[j]) * k + prev[j]
+            out[j].append(round(prev[j], 2))
+    return dict(zip(periods, out))
+
+#  Incremental (online) versions 
+# Each keeps just enough state to take one more price in O(1), so a live
+# feed does not recompute the whole series on every tick. to_dict/from_dict
+# give plain JSON-safe state so a restarted process can carry on.
+
+class EMAState:
+    """Running EMA; update() returns the same 2dp value ema() would give."""
+
+    def __init__(self, period, ema_prev=None, count=0):
+        period = int(period)  # ensure integer period
+        if period <= 0:
+            raise ValueError("EMA period must be greater than 0.")
+        self.period = period
+        self.k = 2 / (period + 1)  # smoothing factor
+        self.ema_prev = ema_prev   # unrounded, like the loop in ema()
+        self.count = count
+
+    def update(self, price):
+        p = float(price)
+        if self.ema_prev is None:
+            self.ema_prev = p  # seed EMA with first price
+        self.ema_prev = (p - self.ema_prev) * self.k + self.ema_prev
+        self.count += 1
+        return round(self.ema_prev, 2)
+
+    def extend(self, prices):
+        return [self.update(p) for p in prices]
+
+    @property
+    def value(self):
+        return None if self.ema_prev is None else round(self.ema_prev, 2)
+
+    def to_dict(self):
+        return {"period": self.period, "ema_prev": self.ema_prev, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["period"], state["ema_prev"], state["count"])
+
+
+class RunningZScore:
+    """Running mean/variance (Welford) for z-scoring against everything seen so far."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2  # sum of squared differences from the mean
+
+    def update(self, value):
+        x = float(value)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        return self.z_score(x)
+
+    def extend(self, values):
+        return [self.update(v) for v in values]
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0  # population, as z_score_normalisation
+
+    @property
+    def std_dev(self):
+        return self.variance ** 0.5
+
+    def z_score(self, value):
+        if not self.count:
+            raise ValueError("No data provided for normalisation.")
+        std_dev = self.std_dev
+        if std_dev == 0:
+            return 0  # all values identical
+        return (float(value) - self.mean) / std_dev
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["count"], state["mean"], state["m2"])
+
+
+class RunningMinMax:
+    """Running min/max plus the position of the first occurrence of each."""
+
+    def __init__(self, count=0, min_val=None, max_val=None, min_idx=None, max_idx=None):
+        self.count = count
+        self.min_val, self.max_val = min_val, max_val
+        self.min_idx, self.max_idx = min_idx, max_idx
+
+    def update(self, price):
+        if self.count == 0 or price < self.min_val:
+            self.min_val, self.min_idx = price, self.count
+        if self.count == 0 or price > self.max_val:
+            self.max_val, self.max_idx = price, self.count
+        self.count += 1
+        return self.min_val, self.max_val
+
+    def extend(self, prices):
+        for p in prices:
+            self.update(p)
+        return self.result()
+
+    def result(self):
+        if not self.count:
+            raise ValueError("No prices provided for recursive min/max.")
+        return self.min_val, self.max_val
+
+    def to_dict(self):
+        return {"count": self.count, "min_val": self.min_val, "max_val": self.max_val,
+                "min_idx": self.min_idx, "max_idx": self.max_idx}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
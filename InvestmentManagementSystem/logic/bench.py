@@ -0,0 +1,222 @@
+# logic/bench.py
+# Reproducible benchmarks of the data and algorithm hot paths.
+#
+#   python -m logic.bench                                  # 10^3 .. 10^6, every case
+#   python -m logic.bench --sizes 1e3,1e5,1e7 --only portfolio,indicators
+#   python -m logic.bench --out today.json                 # save results
+#   python -m logic.bench --baseline today.json            # exit 1 on a regression
+#
+# Inputs are synthetic portfolios and price series from a fixed seed, so
+# two runs (or two machines) time the same work. Every case is run a few
+# times after a warm-up, until --min-time has passed; the report gives
+# latency percentiles over those runs, throughput (items per second at
+# the median), and peak Python/NumPy memory of one extra run under
+# tracemalloc. Each case has a size limit (pure Python paths stop at
+# 10^6, the row-by-row CSV loader at 10^5); --no-limit lifts it.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from logic import algorithms, decimate, indicators
+from logic.data_handler import Portfolio
+from logic.metrics import metrics
+from logic.valuation import Valuation
+
+TICKERS = 500
+NAMES = np.array(["T" + chr(65 + i % 26) + chr(65 + i // 26 % 26) for i in range(TICKERS)])
+ASSET_TYPES = np.array(["Stock", "ETF", "Crypto", "Bond", "Other"])
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+#  synthetic inputs
+def synthetic_columns(n, rng):
+    """Portfolio columns (tickers, prices, quantities, dates, asset types) for n lots."""
+    tickers = NAMES[rng.integers(0, TICKERS, n)]
+    prices = np.round(rng.uniform(1, 500, n), 2)
+    quantities = rng.integers(1, 100, n)
+    dates = (np.datetime64("2020-01-01") + rng.integers(0, 2000, n)).astype(str)
+    return tickers, prices, quantities, dates, ASSET_TYPES[rng.integers(0, len(ASSET_TYPES), n)]
+
+
+def synthetic_portfolio(n, rng):
+    pf = Portfolio()
+    pf._add_rows(*synthetic_columns(n, rng))
+    return pf
+
+
+def synthetic_prices(n, rng):
+    """Random-walk closes, 2dp, as a list (what the GUI and algorithms.py work on)."""
+    return np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), 2).tolist()
+
+
+#  cases: setup(n, rng, tmp) -> state (untimed), run(state) is timed
+class Case:
+    """items: work units per run for throughput, when not n (e.g. a fixed number of ticks)."""
+
+    def __init__(self, name, group, setup, run, limit=10 ** 7, items=None):
+        self.name, self.group, self.setup, self.run, self.limit = name, group, setup, run, limit
+        self.items = items
+
+
+def _csv_file(n, rng, tmp):
+    path = os.path.join(tmp, f"lots_{n}.csv")
+    if not os.path.exists(path):
+        synthetic_portfolio(n, rng).save_csv(path)
+    return path
+
+
+def _snapshot_file(n, rng, tmp):
+    path = os.path.join(tmp, f"lots_{n}.snap")
+    synthetic_portfolio(n, rng).save_snapshot(path)
+    return path
+
+
+def _quiet_load_csv(path):
+    with contextlib.redirect_stdout(io.StringIO()):  # load_csv prints every lot
+        Portfolio().load_csv(path)
+
+
+def _tick(state):
+    valuation, names, prices = state
+    for name, price in zip(names, prices):
+        valuation.update({name: price})
+
+
+def _valuation(n, rng, _tmp):
+    pf = synthetic_portfolio(n, rng)
+    valuation = Valuation(pf, {t: 100.0 for t in pf.totals_by("ticker")})
+    valuation.rebuild()
+    return valuation
+
+
+CASES = [
+    Case("portfolio.load_csv", "portfolio", _csv_file, _quiet_load_csv, limit=10 ** 5),
+    Case("portfolio.load_csv_bulk", "portfolio", _csv_file, lambda path: Portfolio().load_csv_bulk(path)),
+    Case("portfolio.save_csv", "portfolio",
+         lambda n, rng, tmp: (synthetic_portfolio(n, rng), os.path.join(tmp, "out.csv")),
+         lambda state: state[0].save_csv(state[1])),
+    Case("portfolio.load_snapshot", "portfolio", _snapshot_file, lambda path: Portfolio().load_snapshot(path)),
+    Case("portfolio.totals_by", "portfolio", lambda n, rng, tmp: synthetic_portfolio(n, rng),
+         lambda pf: pf.totals_by("ticker")),
+    Case("portfolio.view_ids_by_value", "portfolio", lambda n, rng, tmp: synthetic_portfolio(n, rng),
+         lambda pf: pf.view_ids(sort_by="value", descending=True)),
+    Case("valuation.rebuild", "valuation", _valuation, lambda v: v.rebuild()),
+    Case("valuation.100_ticks", "valuation",
+         lambda n, rng, tmp: (_valuation(n, rng, tmp), NAMES[rng.integers(0, TICKERS, 100)].tolist(),
+                              rng.uniform(1, 500, 100).tolist()),
+         _tick, items=100),
+    Case("algorithms.ema", "algorithms", lambda n, rng, tmp: synthetic_prices(n, rng),
+         lambda p: algorithms.ema(p, 12), limit=10 ** 6),
+    Case("algorithms.z_score_normalisation", "algorithms", lambda n, rng, tmp: synthetic_prices(n, rng),
+         algorithms.z_score_normalisation, limit=10 ** 6),
+    Case("algorithms.recursive_min_max", "algorithms", lambda n, rng, tmp: synthetic_prices(n, rng),
+         algorithms.recursive_min_max, limit=10 ** 6),
+    Case("algorithms.rolling_min_max", "algorithms", lambda n, rng, tmp: synthetic_prices(n, rng),
+         lambda p: algorithms.rolling_min_max(p, 20), limit=10 ** 6),
+    Case("indicators.ema", "indicators", lambda n, rng, tmp: np.array(synthetic_prices(n, rng)),
+         lambda p: indicators.ema(p, 12)),
+    Case("indicators.z_score_normalisation", "indicators", lambda n, rng, tmp: np.array(synthetic_prices(n, rng)),
+         indicators.z_score_normalisation),
+    Case("decimate.min_max_1000px", "indicators", lambda n, rng, tmp: np.array(synthetic_prices(n, rng)),
+         lambda y: decimate.decimate(np.arange(len(y)), y, 1000)),
+]
+
+
+#  measuring
+def measure(case, n, seed, tmp, min_time=0.5, min_repeats=3, max_repeats=50):
+    """Timings of case at size n: latency percentiles (s), throughput (items/s), peak memory (bytes)."""
+    items = case.items or n
+    state = case.setup(n, np.random.default_rng([seed, n]), tmp)
+    case.run(state)  # warm-up: caches, lazy imports, page faults
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeats and (len(times) < min_repeats or time.perf_counter() - started < min_time):
+        t = time.perf_counter()
+        case.run(state)
+        times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    case.run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {"case": case.name, "n": n, "runs": len(times), "p50_s": float(p50), "p90_s": float(p90),
+            "p99_s": float(p99), "min_s": min(times), "items_per_s": items / p50 if p50 else float("inf"),
+            "peak_bytes": peak}
+
+
+def environment():
+    return {"python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, threshold=1.25):
+    """Cases whose median got slower than threshold x the baseline's: [(case, n, old s, new s)]."""
+    old = {(r["case"], r["n"]): r["p50_s"] for r in baseline["results"]}
+    return [(r["case"], r["n"], old[r["case"], r["n"]], r["p50_s"]) for r in results
+            if (r["case"], r["n"]) in old and r["p50_s"] > threshold * old[r["case"], r["n"]]]
+
+
+def _format(r):
+    return (f"{r['case']:<34}{r['n']:>10,}{r['runs']:>5}{r['p50_s'] * 1e3:>11.3f}{r['p90_s'] * 1e3:>11.3f}"
+            f"{r['p99_s'] * 1e3:>11.3f}{r['items_per_s']:>14,.0f}{r['peak_bytes'] / 2 ** 20:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m logic.bench", description="Benchmark the hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated item counts, e.g. 1e3,1e5,1e7")
+    parser.add_argument("--only", help="comma-separated groups or case names "
+                                       f"({', '.join(sorted({c.group for c in CASES}))})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds of timed runs per case (default 0.5)")
+    parser.add_argument("--no-limit", action="store_true", help="run every size even for slow cases")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="earlier --out file; exit 1 if a case got slower")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    wanted = set(args.only.split(",")) if args.only else None
+    cases = [c for c in CASES if wanted is None or c.group in wanted or c.name in wanted]
+    print(f"{'case':<34}{'n':>10}{'runs':>5}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'items/s':>14}{'peak MiB':>10}")
+    results = []
+    tmp = tempfile.mkdtemp()
+    try:
+        for case in cases:
+            for n in sizes:
+                if n > case.limit and not args.no_limit:
+                    continue
+                results.append(measure(case, n, args.seed, tmp, args.min_time))
+                print(_format(results[-1]), flush=True)
+    finally:
+        shutil.rmtree(tmp)
+
+    report = {"environment": environment(), "seed": args.seed, "results": results,
+              "instrumentation": metrics.snapshot()}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f), args.threshold)
+        for name, n, old, new in slower:
+            print(f"REGRESSION {name} n={n:,}: {old * 1e3:.3f} ms -> {new * 1e3:.3f} ms ({new / old:.2f}x)")
+        if slower:
+            return 1
+        print(f"no regressions against {args.baseline} (threshold {args.threshold}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
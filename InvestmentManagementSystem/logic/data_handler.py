@@ -1,43 +1,177 @@
 import csv  # for simple CSV persistence
+from collections import namedtuple
+from contextlib import contextmanager
+from logic.journal import Journal  # write-ahead log of mutations
+from logic.metrics import timed, count  # timings of the I/O paths, see logic/metrics.py
+from logic.store import ColumnStore  # columnar storage for lots
+
+CSV_HEADER = ["ticker", "price", "quantity", "date", "asset_type"]
+
+# one problem found by load_csv_bulk; field is None when the whole row is bad
+RowError = namedtuple("RowError", ["line", "field", "value", "message"])
+
+# what a mutation (or a whole batch) changed, passed to subscribe() callbacks;
+# reloaded means the contents were replaced wholesale (load_csv etc.)
+Change = namedtuple("Change", ["added", "edited", "deleted", "reloaded"])
+
+
+class BatchError(ValueError):
+    """Raised by add_many when any row is invalid; .errors lists every RowError (line = row number)."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid value(s) in batch, nothing was added.")
+        self.errors = errors
+
+def _field(name):
+    """Read-only property for one column of the lot's row, found by id.
+
+    Writes must go through Portfolio.edit_by_id so the journal, running
+    total and subscribers see them.
+    """
+    def get(self):
+        return self._store.get_field(self._store.row_for_id(self._id), name)
+
+    def set(self, value):
+        raise AttributeError(f"Investment.{name} is read-only; use Portfolio.edit_by_id.")
+    return property(get, set)
+
 
 class Investment:
-    def __init__(self, ticker, price, quantity, date, asset_type="Unknown"):
-        self.ticker = ticker.upper()        # ticker
-        self.price = float(price)           # store as float for math
-        self.quantity = int(quantity)       # store as int 
-        self.date = date                    # keep as string (YYYY-MM-DD)
-        self.asset_type = asset_type        # NEW: store asset type (e.g. Stock, Crypto)
+    """One lot. A lightweight view onto a row of the Portfolio's column store."""
+
+    __slots__ = ("_store", "_id")  # no per-lot __dict__
+
+    def __init__(self, ticker, price, quantity, date, asset_type="Unknown", inv_id=None):
+        # a standalone Investment gets its own one-row store
+        self._store = ColumnStore()
+        self._id = self._store.append(ticker.upper(), price, quantity, date, asset_type, inv_id)  # NEW: store asset type (e.g. Stock, Crypto)
+
+    @classmethod
+    def _view(cls, store, inv_id):
+        inv = object.__new__(cls)  # skip __init__, just point at the lot
+        inv._store = store
+        inv._id = inv_id
+        return inv
+
+    @property
+    def id(self):
+        return self._id  # stable for the life of the lot, unlike its position
+
+    ticker = _field("ticker")
+    price = _field("price")             # float for math
+    quantity = _field("quantity")       # int
+    date = _field("date")               # string (YYYY-MM-DD)
+    asset_type = _field("asset_type")
+
+    def profit(self, current_price):
+        """Unrealised profit of the lot at current_price (e.g. PriceStore.latest)."""
+        return (float(current_price) - self.price) * self.quantity
 
     def __str__(self):
         return f"{self.ticker} ({self.asset_type}): {self.quantity} shares at {self.price} each on {self.date}"  # UPDATED to show asset type
 
 
+class DeletedInvestment:
+    """Plain copy of a lot returned by delete_by_id; not backed by any store."""
+
+    __slots__ = ("id", "ticker", "price", "quantity", "date", "asset_type")
+
+    def __init__(self, inv_id, ticker, price, quantity, date, asset_type):
+        self.id = inv_id
+        self.ticker = ticker
+        self.price = price
+        self.quantity = quantity
+        self.date = date
+        self.asset_type = asset_type
+
+    profit = Investment.profit
+    __str__ = Investment.__str__
+
+
+class _Items:
+    """Read-only sequence of Investment views, so portfolio.items still works."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, index):
+        store = self._store
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(store)))]
+        if index < 0:
+            index += len(store)
+        if index < 0 or index >= len(store):
+            raise IndexError("Invalid investment index.")
+        return Investment._view(store, store.ids[store.live_row(index)])
+
+    def __iter__(self):
+        store = self._store
+        for row in store.live_rows():
+            yield Investment._view(store, store.ids[row])
+
+    def clear(self):
+        self._store.clear()
+
+
 class Portfolio:
     def __init__(self):
-        self.items = []                     # holds Investment objects
+        self._store = ColumnStore()         # one typed array per field
+        self.items = _Items(self._store)    # Investment views over the store
+        self._journal = None                # write-ahead journal, see open_journal
+        self._journal_lsn = 0               # last journal seq already in the loaded snapshot
+        self._snapshot_file = "data/investments.snap"
+        self.compact_every = 10_000         # journal records before folding into the snapshot
+        self._total_value = 0.0             # running sum of price * quantity, updated by deltas
+        self._listeners = []                # callbacks for subscribe()
+        self._batch_depth = 0
+        self._pending = None                # Change being collected inside batch()
 
     def add_investment(self, ticker, price, quantity, date, asset_type="Unknown"):
         self._validate(ticker, price, quantity, date)  # raise if bad input
-        inv = Investment(ticker, price, quantity, date, asset_type)  # UPDATED: pass asset_type
-        self.items.append(inv)              # add to portfolio
+        inv = self._add_row(ticker.upper(), float(price), int(quantity), date, asset_type)  # UPDATED: pass asset_type
         print(f"Investment added: {inv}")
         return inv
 
-    def edit_investment(self, index, new_price=None, new_quantity=None, new_asset_type=None):
+    def edit_investment(self, index, new_price=None, new_quantity=None, new_asset_type=None,
+                        new_ticker=None, new_date=None):
         self._validate_index(index)         # makes ensure index exists
-        inv = self.items[index]
+        return self.edit_by_id(self.items[index].id, new_price, new_quantity, new_asset_type,
+                               new_ticker, new_date)
+
+    def delete_investment(self, index):
+        self._validate_index(index)         # makes sure ensure index exists
+        return self.delete_by_id(self.items[index].id)
+
+    #  by stable id: O(1), unaffected by sorting or earlier deletes
+    def get(self, inv_id):
+        self._store.row_for_id(inv_id)      # KeyError if no such lot
+        return Investment._view(self._store, inv_id)
+
+    def edit_by_id(self, inv_id, new_price=None, new_quantity=None, new_asset_type=None,
+                   new_ticker=None, new_date=None):
+        self._store.row_for_id(inv_id)
+        changes = {}                        # convert everything first so a bad value changes nothing
         if new_price is not None:
-            inv.price = float(new_price)    # update price if provided
+            changes["price"] = float(new_price)    # update price if provided
         if new_quantity is not None:
-            inv.quantity = int(new_quantity)
+            changes["quantity"] = int(new_quantity)
         if new_asset_type is not None:       # NEW: allow updating asset type
-            inv.asset_type = new_asset_type
+            changes["asset_type"] = new_asset_type
+        if new_ticker is not None:
+            changes["ticker"] = new_ticker.upper()
+        if new_date is not None:
+            changes["date"] = new_date
+        inv = self._edit_row(inv_id, changes)
         print(f"Investment updated: {inv}")
         return inv
 
-    def delete_investment(self, index):
-        self._validate_index(index)         # makes sure ensure index exists
-        removed = self.items.pop(index)     # remove and return the object
+    def delete_by_id(self, inv_id):
+        removed = self._delete_row(inv_id)  # remove and return a DeletedInvestment
         print(f"Deleted investment: {removed}")
         return removed
 
@@ -49,15 +183,249 @@ class Portfolio:
         for idx, inv in enumerate(self.items):# loop through all Investment objects
             print(f"[{idx}] {inv}")           # print index + investment details
 
+    #  batches: validate once, apply all-or-nothing, notify once
+    @timed()
+    def add_many(self, rows):
+        """Add (ticker, price, quantity, date[, asset_type]) rows; all are validated before any is added.
+
+        Raises BatchError listing every bad value. Returns the new Investments.
+        """
+        import numpy as np
+        rows = [tuple(r) if len(r) == 5 else (*r, "Unknown") for r in rows]
+        if not rows:
+            return []
+        # None becomes "" rather than "None", so it fails validation like in _validate;
+        # price and quantity stay objects so they go through float()/int() like there too
+        col = [np.array(["" if r[i] is None else r[i] if i in (1, 2) else str(r[i]) for r in rows],
+                        dtype=object if i in (1, 2) else str) for i in range(5)]
+        valid, prices, quantities, errors = _validate_columns(col[0], col[1], col[2], col[3],
+                                                              range(len(rows)))
+        if errors:
+            raise BatchError(errors)
+        first_id = self._add_rows(np.char.upper(col[0]), prices, quantities, col[3], col[4])
+        print(f"Investments added: {len(rows)}")
+        return [Investment._view(self._store, i) for i in range(first_id, first_id + len(rows))]
+
+    @timed()
+    def delete_many(self, inv_ids):
+        """Delete lots by id; every id is checked first, so a bad one deletes nothing."""
+        inv_ids = list(inv_ids)
+        missing = [i for i in inv_ids if not 0 < i < len(self._store.row_of) or self._store.row_of[i] < 0]
+        if missing or len(set(inv_ids)) != len(inv_ids):
+            raise KeyError(f"No investment with id(s) {missing or 'repeated'}; nothing was deleted.")
+        with self.batch():
+            removed = [self._delete_row(i, log=False) for i in inv_ids]
+            self._log("D", inv_ids)  # one journal record for the whole batch
+        print(f"Investments deleted: {len(removed)}")
+        return removed
+
+    @contextmanager
+    def batch(self):
+        """Group mutations so subscribers get a single Change (one GUI refresh) at the end."""
+        if self._batch_depth == 0:
+            self._pending = Change([], [], [], False)
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                change, self._pending = self._pending, None
+                if self._journal is not None:
+                    self._journal.sync()  # one group commit per batch
+                self._emit(change)
+
+    def subscribe(self, callback):
+        """Call callback(change) after every mutation, or once per batch."""
+        self._listeners.append(callback)
+
+    def _notify(self, added=(), edited=(), deleted=(), reloaded=False):
+        if self._pending is not None:
+            self._pending.added.extend(added)
+            self._pending.edited.extend(edited)
+            self._pending.deleted.extend(deleted)
+            if reloaded:
+                self._pending = self._pending._replace(reloaded=True)
+        else:
+            self._emit(Change(list(added), list(edited), list(deleted), reloaded))
+
+    def _emit(self, change):
+        if change.added or change.edited or change.deleted or change.reloaded:
+            for callback in self._listeners:
+                callback(change)
+
+    #  raw mutations: no validation or printing, journaled if a journal is open
+    def _add_row(self, ticker, price, quantity, date, asset_type, inv_id=None):
+        inv_id = self._store.append(ticker, price, quantity, date, asset_type, inv_id)
+        self._total_value += price * quantity
+        self._log("a", inv_id, ticker, price, quantity, date, asset_type)
+        self._notify(added=[inv_id])
+        return Investment._view(self._store, inv_id)
+
+    def _add_rows(self, tickers, prices, quantities, dates, asset_types, first_id=None):
+        first_id = self._store.extend_columns(tickers, prices, quantities, dates, asset_types, first_id)
+        self._total_value += float((prices * quantities).sum())
+        self._log("A", first_id, tickers.tolist(), prices.tolist(), quantities.tolist(),
+                  dates.tolist(), asset_types.tolist())  # one journal record for the whole batch
+        self._notify(added=range(first_id, first_id + len(prices)))
+        return first_id
+
+    def _edit_row(self, inv_id, changes):
+        store = self._store
+        row = store.row_for_id(inv_id)
+        old_value = store.price[row] * store.quantity[row]
+        for field, value in changes.items():
+            store.set_field(row, field, value)
+        self._total_value += store.price[row] * store.quantity[row] - old_value
+        self._log("e", inv_id, changes)
+        self._notify(edited=[inv_id])
+        return Investment._view(store, inv_id)
+
+    def _delete_row(self, inv_id, log=True):
+        values = self._store.delete(self._store.row_for_id(inv_id))  # tombstone, no shifting
+        self._total_value -= values[1] * values[2]
+        if log:
+            self._log("d", inv_id)
+        self._notify(deleted=[inv_id])
+        return DeletedInvestment(inv_id, *values)  # O(1), unlike a one-row store sized by id
+
+    #  journal (append-only, replayed on startup)
+    @timed()
+    def open_journal(self, filename="data/investments.journal", snapshot="data/investments.snap",
+                     commit_interval=1.0, replay=True):
+        """Start journaling mutations. Call after load_snapshot; records newer than it are replayed.
+
+        Pass replay=False when the portfolio came from somewhere else (e.g. the CSV):
+        the old journal is then discarded and a fresh snapshot becomes the base.
+        """
+        self._snapshot_file = snapshot
+        if replay:
+            for _seq, op, args in Journal.read(filename, after_seq=self._journal_lsn):
+                self._apply(op, args)
+        self._journal = Journal(filename, commit_interval, start_seq=self._journal_lsn)
+        if not replay or self._journal.records >= self.compact_every:
+            self.compact()
+
+    def sync_journal(self):
+        if self._journal is not None:
+            self._journal.sync()
+
+    def vacuum(self):
+        """Squeeze deleted lots out of the columns (also happens automatically)."""
+        self._store.vacuum()
+
+    @timed()
+    def compact(self):
+        """Fold the journal into the snapshot, then empty the journal."""
+        self._store.vacuum()  # the snapshot write is O(n) anyway
+        self.save_snapshot(self._snapshot_file)  # records the journal seq it covers
+        if self._journal is not None:
+            self._journal.truncate()
+            self._journal_lsn = self._journal.seq
+
+    def close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _log(self, op, *args):
+        if self._journal is None:
+            return
+        self._journal.append(op, *args)
+        if self._journal.records >= self.compact_every:
+            self.compact()
+
+    def _apply(self, op, args):
+        if op == "a":
+            inv_id, *values = args
+            self._add_row(*values, inv_id=inv_id)
+        elif op == "e":
+            self._edit_row(*args)
+        elif op == "d":
+            self._delete_row(*args)
+        elif op == "A":
+            import numpy as np
+            first_id, tickers, prices, quantities, dates, asset_types = args
+            self._add_rows(np.array(tickers, dtype=str), np.array(prices, dtype=np.float64),
+                           np.array(quantities, dtype=np.int64), np.array(dates, dtype=str),
+                           np.array(asset_types, dtype=str), first_id)
+        elif op == "D":
+            for inv_id in args[0]:
+                self._delete_row(inv_id, log=False)
+        else:
+            raise ValueError(f"Unknown journal record {op!r}.")
+
+    @contextmanager
+    def _reloading(self):
+        """Replace the contents without journaling or notifying every row; the reload becomes the new base."""
+        journal, self._journal = self._journal, None
+        listeners, self._listeners = self._listeners, []  # one reloaded Change instead of a row each
+        try:
+            yield
+        finally:
+            self._journal = journal
+            self._listeners = listeners
+            self._total_value = self._store.total_value()  # fresh sum, no accumulated drift
+        if journal is not None:
+            self.compact()
+        self._notify(reloaded=True)
+
+    #  indexed queries
+    def find(self, ticker=None, asset_type=None, start=None, end=None):
+        """Investments matching every given filter, e.g. find(ticker="TSLA", start="2025-07-01").
+
+        Uses the ticker/asset type/date indexes, so cost grows with the matches, not the portfolio.
+        """
+        rows = self._store.index.query(ticker.upper() if ticker is not None else None,
+                                       asset_type, start, end)
+        ids = self._store.ids
+        return [Investment._view(self._store, ids[r]) for r in rows]
+
+    def view_ids(self, sort_by=None, descending=False, ticker=None, asset_type=None, start=None, end=None):
+        """Ids of the lots matching the filters, ordered by sort_by (a field or "value") as a NumPy array.
+
+        Lets a table show a sorted/filtered window without building an Investment per lot.
+        """
+        import numpy as np
+        store = self._store
+        if ticker is None and asset_type is None and start is None and end is None:
+            rows = np.flatnonzero(np.frombuffer(store.alive, dtype=np.uint8))
+        else:
+            rows = np.asarray(store.index.query(ticker.upper() if ticker is not None else None,
+                                                asset_type, start, end), dtype=np.int64)
+        if sort_by is not None:
+            rows = store.order_rows(rows, sort_by, descending)
+        return np.frombuffer(store.ids, dtype=np.int64)[rows]
+
+    #  totals (vectorized over the columns)
+    def total_value(self):
+        return self._total_value  # O(1); self._store.total_value() recomputes from the columns
+
+    def totals_by(self, field, measure="value"):
+        """Total value (or quantity, measure="quantity") grouped by "ticker" or "asset_type"."""
+        return self._store.totals_by(field, measure)
+
+    def unrealised_profit(self, prices):
+        """Market value minus cost of the lots whose ticker has a price in prices ({ticker: price})."""
+        quantities = self.totals_by("ticker", measure="quantity")
+        costs = self.totals_by("ticker")
+        return sum(quantities[t] * prices[t] - costs[t] for t in quantities if t in prices)
+
     #   persistence (CSV) 
+    @timed()
     def save_csv(self, filename="data/investments.csv"):
-        with open(filename, "w", newline="") as f:
+        with open(filename, "w", newline="", buffering=1 << 20) as f:  # big buffer, few writes
             writer = csv.writer(f)
-            writer.writerow(["ticker", "price", "quantity", "date", "asset_type"])  # UPDATED header
-            for inv in self.items:
-                writer.writerow([inv.ticker, inv.price, inv.quantity, inv.date, inv.asset_type])  # UPDATED row
+            writer.writerow(CSV_HEADER)  # UPDATED header
+            writer.writerows(self._store.iter_rows())  # straight from the columns
+        count("portfolio.rows_saved", len(self._store))
 
+    @timed()
     def load_csv(self, filename="data/investments.csv"):
+        with self._reloading():
+            self._load_csv(filename)
+
+    def _load_csv(self, filename):
         self.items.clear()                  # reset current list
         try:
             with open(filename, "r") as f:
@@ -74,6 +442,73 @@ class Portfolio:
             # ok to start empty if file doesn't exist yet
             pass
 
+    @timed()
+    def load_csv_bulk(self, filename="data/investments.csv"):
+        """Load a CSV a column at a time. Bad rows are skipped and returned as RowErrors."""
+        with self._reloading():
+            errors = self._load_csv_bulk(filename)
+        count("portfolio.rows_loaded", len(self._store))
+        count("portfolio.rows_rejected", len({e.line for e in errors}))
+        return errors
+
+    def _load_csv_bulk(self, filename):
+        self.items.clear()
+        try:
+            with open(filename, "r", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                rows = list(reader)
+        except FileNotFoundError:
+            return []  # ok to start empty if file doesn't exist yet
+        if not header:
+            return []
+        missing = [name for name in CSV_HEADER[:4] if name not in header]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+        errors = []
+        width = len(header)
+        if set(map(len, rows)) <= {width}:
+            good_rows, lines = rows, range(2, len(rows) + 2)  # header is line 1
+        else:
+            good_rows, lines = [], []
+            for line, row in enumerate(rows, start=2):
+                if len(row) == width:
+                    good_rows.append(row)
+                    lines.append(line)
+                elif row:  # blank lines are skipped like DictReader does
+                    errors.append(RowError(line, None, row, "Wrong number of fields."))
+        if not good_rows:
+            return errors
+
+        import numpy as np
+        col = {name: np.array([row[i] for row in good_rows], dtype=str)  # transpose to columns
+               for i, name in enumerate(header)}
+        if "asset_type" not in col:
+            col["asset_type"] = np.full(len(good_rows), "Unknown")  # NEW: safe fallback for old CSVs
+        valid, prices, quantities, col_errors = _validate_columns(
+            col["ticker"], col["price"], col["quantity"], col["date"], lines)
+        errors.extend(col_errors)
+        errors.sort(key=lambda e: e.line)
+
+        self._store.extend_columns(np.char.upper(col["ticker"][valid]), prices[valid],
+                                   quantities[valid], col["date"][valid], col["asset_type"][valid])
+        return errors
+
+    #   persistence (binary snapshot) 
+    @timed()
+    def save_snapshot(self, filename="data/investments.snap"):
+        from logic.snapshot import write_snapshot  # numpy only when snapshots are used
+        lsn = self._journal.seq if self._journal is not None else self._journal_lsn
+        write_snapshot(self._store, filename, journal_lsn=lsn)
+
+    @timed()
+    def load_snapshot(self, filename="data/investments.snap"):
+        from logic.snapshot import Snapshot
+        with self._reloading(), Snapshot(filename) as snap:
+            snap.fill_store(self._store)
+            self._journal_lsn = snap.journal_lsn
+
     #  helpers 
     def _validate_index(self, index):
         if index < 0 or index >= len(self.items):
@@ -86,18 +521,57 @@ class Portfolio:
             p = float(price)
             if p <= 0:
                 raise ValueError("Price must be greater than 0.")
-        except ValueError:
+        except (TypeError, ValueError):
             raise ValueError("Price must be a number greater than 0.")
         try:
             q = int(quantity)
             if q <= 0:
                 raise ValueError("Quantity must be greater than 0.")
-        except ValueError:
+        except (TypeError, ValueError):
             raise ValueError("Quantity must be an integer greater than 0.")
         if not date:
             raise ValueError("Date cannot be empty.")
 
 
+def parse_column(values, convert, dtype):
+    """Convert a column of strings to dtype in one go; returns (values, bad mask).
+
+    Falls back to convert() per value to find the bad ones. Shared by the CSV loaders.
+    """
+    import numpy as np
+    try:
+        return values.astype(dtype), np.zeros(len(values), dtype=bool)
+    except (ValueError, OverflowError):
+        out = np.zeros(len(values), dtype=dtype)
+        bad = np.zeros(len(values), dtype=bool)
+        for i, v in enumerate(values):
+            try:
+                out[i] = convert(v)
+            except (ValueError, OverflowError):
+                bad[i] = True
+        return out, bad
+
+
+def _validate_columns(tickers, prices, quantities, dates, lines):
+    """Column-wise version of Portfolio._validate; returns (valid mask, prices, quantities, errors)."""
+    import numpy as np
+    n = len(tickers)
+    p, bad_price = parse_column(prices, float, np.float64)
+    q, bad_qty = parse_column(quantities, int, np.int64)
+    checks = [
+        ("ticker", tickers, ~np.char.isalpha(tickers), "Ticker must be letters only."),
+        ("price", prices, bad_price | (p <= 0), "Price must be a number greater than 0."),
+        ("quantity", quantities, bad_qty | (q <= 0), "Quantity must be an integer greater than 0."),
+        ("date", dates, np.char.str_len(dates) == 0, "Date cannot be empty."),
+    ]
+    valid = np.ones(n, dtype=bool)
+    errors = []
+    for field, column, bad, message in checks:
+        valid &= ~bad
+        errors.extend(RowError(lines[i], field, str(column[i]), message) for i in np.flatnonzero(bad))
+    return valid, p, q, errors
+
+
 # manual test 
 if __name__ == "__main__":
     pf = Portfolio()
@@ -0,0 +1,86 @@
+# logic/decimate.py
+# Cut a long series down to one or two points per screen pixel before it
+# is plotted. Both methods return indexes into the original arrays, so any
+# parallel column (dates, EMA, ...) can be picked with the same indexes.
+#   min_max  lowest and highest point of each bucket: keeps every spike
+#   lttb     Largest-Triangle-Three-Buckets: keeps the visual shape with
+#            one point per bucket
+
+import numpy as np
+
+
+def min_max(y, buckets):
+    """Indexes of the min and max of each of `buckets` equal slices, plus the ends, in order."""
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)  # ceil
+    pad = (-n) % size
+    padded = np.concatenate([y, np.full(pad, y[-1])]).reshape(-1, size)  # repeat the last value
+    offsets = np.arange(0, len(padded) * size, size)
+    idx = np.concatenate([[0, n - 1], offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)])
+    return np.unique(np.minimum(idx, n - 1))  # sorted, duplicates dropped
+
+
+def lttb(x, y, n_out):
+    """Indexes of n_out points chosen by Largest-Triangle-Three-Buckets (first and last always kept)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets between the ends
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0  # point picked in the previous bucket
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):  # average of the next bucket is the third corner
+            cx, cy = x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def visible(x, lo, hi):
+    """slice of sorted x inside [lo, hi], one point wider each side so lines reach the edges."""
+    start = max(int(np.searchsorted(x, lo, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side="right")) + 1, len(x))
+    return slice(start, stop)
+
+
+def decimate(x, y, pixels, method="min_max", view=None):
+    """Indexes to plot for sorted x within view=(lo, hi) (default all) at `pixels` width."""
+    x = np.asarray(x, dtype=np.float64)
+    window = visible(x, *view) if view is not None else slice(0, len(x))
+    offset = window.start
+    if method == "lttb":
+        idx = lttb(x[window], np.asarray(y)[window], int(pixels))
+    elif method == "min_max":
+        idx = min_max(np.asarray(y)[window], int(pixels))
+    else:
+        raise ValueError(f"Unknown decimation method {method!r}.")
+    return idx + offset
+
+
+# cost of decimating a million points: python -m logic.decimate
+if __name__ == "__main__":
+    import time
+
+    n, pixels = 1_000_000, 1000
+    rng = np.random.default_rng(1)
+    x = np.arange(n, dtype=np.float64)
+    y = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    for method in ("min_max", "lttb"):
+        t = time.perf_counter()
+        idx = decimate(x, y, pixels, method)
+        elapsed = time.perf_counter() - t
+        print(f"{method:<8} {n:,} -> {len(idx):,} points in {elapsed * 1000:6.1f} ms; "
+              f"min/max kept: {y[idx].min() == y.min() and y[idx].max() == y.max()}")
+    t = time.perf_counter()
+    idx = decimate(x, y, pixels, view=(250_000, 260_000))
+    print(f"zoomed to 10,000 points -> {len(idx):,} in {(time.perf_counter() - t) * 1000:.1f} ms")
@@ -0,0 +1,167 @@
+# logic/index.py
+# Secondary indexes over a ColumnStore so queries don't scan every lot.
+#   ticker      hash: ticker code -> set of rows
+#   asset_type  buckets: asset code -> set of rows
+#   date        buckets: date ordinal -> set of rows, plus the sorted distinct
+#               ordinals so a date range is found with bisect
+# Indexes are built on first query and then kept up to date by the store.
+# Deletes only tombstone rows, so they are removed in place too; anything
+# that renumbers rows (vacuum, reload) just marks the indexes stale.
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as _date
+
+
+def _to_ordinal(value):
+    if isinstance(value, _date):
+        return value.toordinal()
+    return _date.fromisoformat(value).toordinal()
+
+
+class StoreIndex:
+    def __init__(self, store):
+        self._store = store
+        self.built = False
+        self.by_ticker = {}
+        self.by_asset = {}
+        self.by_date = {}
+        self.dates = []  # sorted distinct ordinals of plain YYYY-MM-DD dates
+
+    def invalidate(self):
+        self.built = False
+        self.by_ticker, self.by_asset, self.by_date, self.dates = {}, {}, {}, []
+
+    def ensure(self):
+        if not self.built:
+            self.rebuild()
+
+    def rebuild(self):
+        """Build every index from the columns in one pass."""
+        store = self._store
+        rows = list(store.live_rows())  # tombstoned rows are left out
+        self.by_ticker = self._buckets(rows, store.ticker_code)
+        self.by_asset = self._buckets(rows, store.asset_code)
+        self.by_date = self._buckets(rows, store.date_ord)
+        self.dates = sorted(o for o in self.by_date if o > 0)  # odd dates are negative
+        self.built = True
+
+    @staticmethod
+    def _buckets(rows, codes):
+        buckets = {}
+        for row in rows:
+            code = codes[row]
+            bucket = buckets.get(code)
+            if bucket is None:
+                bucket = buckets[code] = set()
+            bucket.add(row)
+        return buckets
+
+    #  incremental maintenance (only while built)
+    def add(self, row):
+        if not self.built:
+            return
+        store = self._store
+        self.by_ticker.setdefault(store.ticker_code[row], set()).add(row)
+        self.by_asset.setdefault(store.asset_code[row], set()).add(row)
+        ordinal = store.date_ord[row]
+        if ordinal not in self.by_date:
+            self.by_date[ordinal] = set()
+            if ordinal > 0:
+                insort(self.dates, ordinal)  # only for a date not seen before
+        self.by_date[ordinal].add(row)
+
+    def remove(self, row):
+        if not self.built:
+            return
+        store = self._store
+        self.by_ticker[store.ticker_code[row]].discard(row)
+        self.by_asset[store.asset_code[row]].discard(row)
+        self.by_date[store.date_ord[row]].discard(row)  # empty buckets are skipped by queries
+
+    #  queries, O(log n + k) (plus one step per distinct date in a date range)
+    def query(self, ticker=None, asset_type=None, start=None, end=None):
+        """Rows matching every given filter; dates are start..end inclusive.
+
+        Results come oldest first when a date filter is given, else in row order.
+        Dates that are not plain YYYY-MM-DD never match a date filter.
+        """
+        self.ensure()
+        store = self._store
+        sets = []
+        if ticker is not None:
+            sets.append(self.by_ticker.get(store.tickers.codes.get(ticker), set()))
+        if asset_type is not None:
+            sets.append(self.by_asset.get(store.asset_types.codes.get(asset_type), set()))
+        dated = start is not None or end is not None
+
+        if dated:
+            first = _to_ordinal(start) if start is not None else 1
+            last = _to_ordinal(end) if end is not None else _date.max.toordinal()
+            days = self.dates[bisect_left(self.dates, first):bisect_right(self.dates, last)]
+            if not sets or sum(len(self.by_date[d]) for d in days) <= min(map(len, sets)):
+                # the date range is the smallest candidate list: walk it in order
+                return [r for d in days for r in sorted(self.by_date[d])
+                        if all(r in s for s in sets)]
+        if not sets:
+            return list(store.live_rows())
+
+        smallest = min(sets, key=len)
+        rows = [r for r in smallest if all(r in s for s in sets if s is not smallest)]
+        if dated:
+            rows = [r for r in rows if first <= store.date_ord[r] <= last]
+            rows.sort(key=lambda r: (store.date_ord[r], r))
+        else:
+            rows.sort()
+        return rows
+
+
+# index maintenance and query cost: python -m logic.index
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import time
+    from logic.data_handler import Portfolio
+
+    random.seed(1)
+    n = 200_000
+    tickers = [f"T{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}" for i in range(500)]
+    rows = [(random.choice(tickers), round(random.uniform(1, 500), 2), random.randint(1, 100),
+             f"{random.randint(2015, 2025)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+             random.choice(["Stock", "ETF", "Crypto"])) for _ in range(n)]
+
+    def fill(indexed):
+        pf = Portfolio()
+        if indexed:
+            pf.find(ticker="TAA")  # builds the (empty) indexes so adds maintain them
+        t = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for r in rows:
+                pf.add_investment(*r)
+        return pf, time.perf_counter() - t
+
+    plain, t_plain = fill(False)
+    pf, t_indexed = fill(True)
+    print(f"{n:,} adds without indexes: {t_plain * 1000:8.1f} ms")
+    print(f"{n:,} adds with indexes:    {t_indexed * 1000:8.1f} ms  (+{(t_indexed - t_plain) / n * 1e6:.2f} us/add)")
+
+    t = time.perf_counter()
+    plain._store.index.rebuild()
+    print(f"full rebuild:                {(time.perf_counter() - t) * 1000:8.1f} ms")
+
+    for label, query, scan in (
+        ("ticker = TAB", lambda: pf.find(ticker="TAB"),
+         lambda: [inv for inv in pf.items if inv.ticker == "TAB"]),
+        ("Q3 2024", lambda: pf.find(start="2024-07-01", end="2024-09-30"),
+         lambda: [inv for inv in pf.items if "2024-07-01" <= inv.date <= "2024-09-30"]),
+        ("Crypto in Q3 2024", lambda: pf.find(asset_type="Crypto", start="2024-07-01", end="2024-09-30"),
+         lambda: [inv for inv in pf.items
+                  if inv.asset_type == "Crypto" and "2024-07-01" <= inv.date <= "2024-09-30"])):
+        t = time.perf_counter()
+        found = query()
+        t_query = time.perf_counter() - t
+        t = time.perf_counter()
+        scanned = scan()
+        t_scan = time.perf_counter() - t
+        assert sorted(map(str, found)) == sorted(map(str, scanned))
+        print(f"{label:<18} {len(found):6,} hits  index {t_query * 1000:7.2f} ms  scan {t_scan * 1000:8.1f} ms")
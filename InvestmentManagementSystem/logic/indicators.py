@@ -0,0 +1,131 @@
+# logic/indicators.py
+# NumPy versions of the algorithms in logic/algorithms.py.
+# Every function takes a 1-D price array or a 2-D (ticker x time) matrix
+# and works along the last axis, so a whole portfolio is one call.
+
+import numpy as np
+
+EMA_BLOCK = 128  # time steps folded into one matrix multiply
+
+
+def _as_matrix(prices):
+    """Return (2-D float array, was_1d) so every function can work row-wise."""
+    arr = np.asarray(prices, dtype=float)
+    if arr.ndim == 1:
+        return arr[np.newaxis, :], True
+    if arr.ndim != 2:
+        raise ValueError("Prices must be a 1-D series or a 2-D (ticker x time) matrix.")
+    return arr, False
+
+
+def _ema_weights(k, block):
+    """Lower-triangular weights so one block of the EMA recurrence is a matmul."""
+    a = 1.0 - k
+    j = np.arange(block)
+    lags = np.clip(j[:, None] - j[None, :], 0, None)      # j - i, clipped for i > j
+    weights = np.tril(k * a ** lags)                       # W[j, i] = k * a^(j - i)
+    carry = a ** (j + 1)                                   # weight of the previous EMA
+    return weights, carry
+
+
+def ema(prices, period, decimals=2, initial=None):
+    """EMA of every row; matches algorithms.ema (pass decimals=None to skip rounding).
+
+    initial carries the unrounded EMA over from an earlier chunk of the same
+    series (one value per row) instead of seeding with the first price.
+    """
+    x, was_1d = _as_matrix(prices)
+    if x.shape[-1] < (1 if initial is not None else 2):
+        raise ValueError("Not enough price data for EMA.")
+    period = int(period)
+    if period <= 0:
+        raise ValueError("EMA period must be greater than 0.")
+    k = 2 / (period + 1)
+
+    # ema_j = a^(j+1) * ema_prev + sum_i k * a^(j-i) * p_i, evaluated a block at a time
+    weights, carry = _ema_weights(k, EMA_BLOCK)
+    n = x.shape[1]
+    out = np.empty_like(x)
+    if initial is None:
+        ema_prev = x[:, 0].copy()  # seed with first price, same as algorithms.ema
+    else:
+        ema_prev = np.broadcast_to(np.asarray(initial, dtype=float), x.shape[:1]).copy()
+    for start in range(0, n, EMA_BLOCK):
+        block = x[:, start:start + EMA_BLOCK]
+        m = block.shape[1]
+        out[:, start:start + m] = block @ weights[:m, :m].T + ema_prev[:, None] * carry[:m]
+        ema_prev = out[:, start + m - 1].copy()
+
+    if decimals is not None:
+        out = np.round(out, decimals)
+    return out[0] if was_1d else out
+
+
+def z_score_normalisation(values):
+    """Z-scores of every row (population std); constant rows become 0."""
+    x, was_1d = _as_matrix(values)
+    if x.shape[-1] == 0:
+        raise ValueError("No data provided for normalisation.")
+    mean = x.mean(axis=1, keepdims=True)
+    std_dev = x.std(axis=1, keepdims=True)
+    safe_std = np.where(std_dev == 0, 1.0, std_dev)          # avoid divide by zero
+    z = np.where(std_dev == 0, 0.0, (x - mean) / safe_std)   # all values identical -> 0
+    return z[0] if was_1d else z
+
+
+def min_max(prices):
+    """Return (min, max, argmin, argmax) for every row; scalars for a 1-D series."""
+    x, was_1d = _as_matrix(prices)
+    if x.shape[-1] == 0:
+        raise ValueError("No prices provided for min/max.")
+    lo_idx = x.argmin(axis=1)
+    hi_idx = x.argmax(axis=1)
+    rows = np.arange(x.shape[0])
+    lo, hi = x[rows, lo_idx], x[rows, hi_idx]
+    if was_1d:
+        return float(lo[0]), float(hi[0]), int(lo_idx[0]), int(hi_idx[0])
+    return lo, hi, lo_idx, hi_idx
+
+
+# benchmark against the pure Python versions: python -m logic.indicators
+if __name__ == "__main__":
+    import random
+    import timeit
+    from logic import algorithms
+
+    random.seed(1)
+    tickers, days = 200, 5000
+    series = []
+    for _ in range(tickers):
+        p = [100.0]
+        for _ in range(days - 1):
+            p.append(round(max(p[-1] * (1 + random.uniform(-2, 2) / 100), 0.01), 2))
+        series.append(p)
+    matrix = np.array(series)
+
+    def run_python():
+        for p in series:
+            algorithms.ema(p, 12)
+            algorithms.z_score_normalisation(p)
+            algorithms.recursive_min_max(p)
+
+    def run_numpy():
+        ema(matrix, 12)
+        z_score_normalisation(matrix)
+        min_max(matrix)
+
+    # check results agree before timing anything
+    ref_ema = np.array([algorithms.ema(p, 12) for p in series])
+    ref_z = np.array([algorithms.z_score_normalisation(p) for p in series])
+    print(f"EMA max abs diff:     {np.abs(ema(matrix, 12) - ref_ema).max():.3g}")
+    print(f"EMA 2dp mismatches:   {int((ema(matrix, 12) != ref_ema).sum())}")
+    print(f"Z-score max abs diff: {np.abs(z_score_normalisation(matrix) - ref_z).max():.3g}")
+    lo, hi, _, _ = min_max(matrix)
+    ref_mm = np.array([algorithms.recursive_min_max(p) for p in series])
+    print(f"Min/max identical:    {np.array_equal(np.c_[lo, hi], ref_mm)}")
+
+    t_py = min(timeit.repeat(run_python, number=1, repeat=3))
+    t_np = min(timeit.repeat(run_numpy, number=1, repeat=3))
+    print(f"\n{tickers} tickers x {days} days")
+    print(f"pure Python: {t_py * 1000:8.1f} ms")
+    print(f"NumPy:       {t_np * 1000:8.1f} ms  ({t_py / t_np:.1f}x faster)")
@@ -0,0 +1,104 @@
+# logic/jobs.py
+# The GUI's price computations split into chunks, so a TaskExecutor can
+# show progress and cancel them between chunks. Results match the list
+# functions in logic/algorithms.py (z-scores up to float rounding).
+# Every job takes progress(done, total), or None when run directly.
+
+import random
+from datetime import datetime, timedelta
+
+from logic.algorithms import EMAState, RunningMinMax
+
+CHUNK = 50_000  # items between progress reports
+
+
+def _chunks(n):
+    for lo in range(0, n, CHUNK):
+        yield lo, min(lo + CHUNK, n)
+
+
+def _report(progress, done, total):
+    if progress is not None:
+        progress(done, total)
+
+
+def simulate_prices(start_price, days=30, max_pct_change=2.0, progress=None):
+    """Random walk of daily +/- max_pct_change % moves ending today; returns (dates, prices)."""
+    base = datetime.today().date()
+    dates = [base - timedelta(days=(days - 1 - i)) for i in range(days)]  # ascending dates
+    prices = [float(start_price)]
+    for lo, hi in _chunks(days):
+        for _ in range(max(lo, 1), hi):
+            pct = random.uniform(-max_pct_change, max_pct_change)  # random daily change
+            next_p = prices[-1] * (1 + pct / 100.0)
+            prices.append(round(max(next_p, 0.01), 2))  # clamp to positive, 2dp
+        _report(progress, hi, days)
+    return dates, prices
+
+
+def ema_series(prices, period, progress=None):
+    """Same values as algorithms.ema()."""
+    if not prices or len(prices) < 2:
+        raise ValueError("Not enough price data for EMA.")
+    state = EMAState(period)
+    out = []
+    for lo, hi in _chunks(len(prices)):
+        out.extend(state.extend(prices[lo:hi]))
+        _report(progress, hi, len(prices))
+    return out
+
+
+def z_scores(values, progress=None):
+    """Same as algorithms.z_score_normalisation(), in two chunked passes."""
+    if not values:
+        raise ValueError("No data provided for normalisation.")
+    n = len(values)
+    mean = sum(values) / n
+    sq = 0.0
+    for lo, hi in _chunks(n):
+        sq += sum((x - mean) ** 2 for x in values[lo:hi])
+        _report(progress, hi, 2 * n)  # first half of the work
+    std_dev = (sq / n) ** 0.5
+    if std_dev == 0:
+        return [0 for _ in values]  # all values identical
+    out = []
+    for lo, hi in _chunks(n):
+        out.extend((x - mean) / std_dev for x in values[lo:hi])
+        _report(progress, n + hi, 2 * n)
+    return out
+
+
+def min_max(prices, progress=None):
+    """(min, max, index of min, index of max), first occurrences, like recursive_min_max + list.index."""
+    state = RunningMinMax()
+    for lo, hi in _chunks(len(prices)):
+        state.extend(prices[lo:hi])
+        _report(progress, hi, len(prices))
+    min_val, max_val = state.result()  # ValueError when empty
+    return min_val, max_val, state.min_idx, state.max_idx
+
+
+# background vs inline on a long series: python -m logic.jobs
+if __name__ == "__main__":
+    import time
+    from logic.algorithms import ema, z_score_normalisation, recursive_min_max
+    from logic.tasks import TaskExecutor
+
+    random.seed(1)
+    _, prices = simulate_prices(100, days=500_000)
+    assert ema_series(prices, 12) == ema(prices, 12)
+    assert min_max(prices)[:2] == recursive_min_max(prices)
+    assert max(abs(a - b) for a, b in zip(z_scores(prices), z_score_normalisation(prices))) < 1e-9
+
+    with TaskExecutor(workers=2) as tasks:
+        t = time.perf_counter()
+        first = tasks.submit("ema", ema_series, prices, 12)
+        tasks.submit("ema", ema_series, prices, 26)  # supersedes the first
+        latest = tasks.submit("minmax", min_max, prices)
+        submit_time = time.perf_counter() - t
+        latest.result()
+        print(f"submit returns in {submit_time * 1000:.2f} ms; superseded job cancelled: {first.cancelled}")
+        t = time.perf_counter()
+        ema(prices, 12)
+        print(f"inline ema over {len(prices):,} prices blocks for {(time.perf_counter() - t) * 1000:.0f} ms")
+        print("batch:", tasks.map(min_max, [prices[:10], prices[10:20]]))
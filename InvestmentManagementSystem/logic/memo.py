@@ -0,0 +1,227 @@
+# logic/memo.py
+# Bounded LRU cache for indicator results.
+#
+# Entries are keyed by (function, series fingerprint, parameters). The
+# function is named by module and qualified name, so same-named functions
+# in different modules never share entries. The fingerprint is the length
+# plus a BLAKE2 hash of the values as float64, so an equal series built
+# again still hits, while any edited value misses. Hashing is O(n): callers
+# that reuse one series object should fingerprint it once and pass fp=.
+# Results are stored read-only (lists become tuples, arrays are
+# non-writeable, dicts are mapping proxies), so a hit costs O(1). When a cached series turns out to be the start of a longer one
+# (a live feed got new prices) its entries are dropped, since the old
+# results will not be asked for again.
+#
+#     from logic.memo import ema          # same signature as logic.algorithms.ema
+#     ema(prices, 12); ema(prices, 12)    # second call is a cache hit
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+
+import numpy as np
+
+from logic import algorithms
+
+HEAD = 256      # values hashed to spot a series that was extended
+MISS = object()
+
+
+def _digest(arr):
+    return hashlib.blake2b(arr.tobytes(), digest_size=16).digest()
+
+
+def fingerprint(series):
+    """(length, hash) of the series' values."""
+    arr = np.ascontiguousarray(series, dtype=np.float64)
+    return len(arr), _digest(arr)
+
+
+def _size(value):
+    """Rough bytes held by a result (lists of floats are ~32 bytes per item)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_size(v) if isinstance(v, (list, tuple, dict, np.ndarray)) else 24
+                                          for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+_NESTED = (list, tuple, dict, np.ndarray)
+
+
+def _freeze(value):
+    """Read-only copy of a result, made once on put so hits can hand out the same object."""
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(v, _NESTED) for v in value):
+            return tuple(_freeze(v) for v in value)
+        return tuple(value)
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _name(fn):
+    """Cache name of a function (or a name given as is); bare __name__ is not unique."""
+    if isinstance(fn, str):
+        return fn
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+class MemoCache:
+    """LRU over (name, fingerprint, params) with entry-count and byte limits."""
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.bytes = 0
+        self._entries = OrderedDict()   # key -> (value, size), least recently used first
+        self._series = {}               # fingerprint -> (head hash, set of keys)
+        self._lock = threading.Lock()   # jobs run on worker threads
+
+    #  lookups
+    def get(self, name, series, params=(), fp=None):
+        """Cached (read-only) result or MISS; name is the function or a string."""
+        key = (_name(name), fp or fingerprint(series), params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0]
+
+    def put(self, name, series, value, params=(), fp=None):
+        """Store value; returns the read-only copy that hits will hand out."""
+        fp = fp or fingerprint(series)
+        key = (_name(name), fp, params)
+        size = _size(value)
+        value = _freeze(value)
+        if size > self.max_bytes:
+            return value  # would evict everything else
+        arr = None
+        if fp not in self._series:  # only a new series needs its values again
+            arr = np.ascontiguousarray(series, dtype=np.float64)
+        with self._lock:
+            if fp not in self._series:
+                if arr is None:  # evicted by another thread meanwhile
+                    arr = np.ascontiguousarray(series, dtype=np.float64)
+                head = _digest(arr[:HEAD])
+                self._drop_prefixes(arr, head)
+                self._series[fp] = (head, set())
+            self._series[fp][1].add(key)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def call(self, fn, series, *params, fp=None):
+        """fn(series, *params), computed once per distinct series and parameters.
+
+        Pass fp=fingerprint(series) when calling repeatedly with the same series.
+        """
+        fp = fp or fingerprint(series)
+        value = self.get(fn, series, params, fp)
+        if value is MISS:
+            value = self.put(fn, series, fn(series, *params), params, fp)
+        return value
+
+    def memoize(self, fn):
+        """Decorator: fn(series, *params) with hashable params goes through this cache."""
+        @wraps(fn)
+        def wrapper(series, *params, fp=None):
+            return self.call(fn, series, *params, fp=fp)
+        wrapper.cache = self
+        return wrapper
+
+    #  invalidation
+    def invalidate(self, series=None):
+        """Drop the entries for one series, or everything."""
+        with self._lock:
+            if series is None:
+                self._entries.clear()
+                self._series.clear()
+                self.bytes = 0
+                return
+            fp = fingerprint(series)
+            for key in list(self._series.get(fp, (None, ()))[1]):
+                self._evict(key)
+                self.invalidations += 1
+
+    def _drop_prefixes(self, arr, head):
+        """A new series that extends a cached one makes the shorter one's results stale."""
+        n = len(arr)
+        for fp, (h, keys) in list(self._series.items()):
+            m = fp[0]
+            if m < n and (h == head or m < HEAD) and _digest(arr[:m]) == fp[1]:
+                for key in list(keys):
+                    self._evict(key)
+                    self.invalidations += 1
+
+    def _evict(self, key):
+        _value, size = self._entries.pop(key)
+        self.bytes -= size
+        keys = self._series[key[1]][1]
+        keys.discard(key)
+        if not keys:
+            del self._series[key[1]]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions, "invalidations": self.invalidations}
+
+
+# shared cache and drop-in cached versions of logic/algorithms.py
+cache = MemoCache()
+ema = cache.memoize(algorithms.ema)
+z_score_normalisation = cache.memoize(algorithms.z_score_normalisation)
+recursive_min_max = cache.memoize(algorithms.recursive_min_max)
+rolling_min_max = cache.memoize(algorithms.rolling_min_max)
+rolling_z_score = cache.memoize(algorithms.rolling_z_score)
+
+
+def ema_bank(prices, periods, fp=None):
+    return cache.call(algorithms.ema_bank, prices, tuple(periods), fp=fp)  # lists are not hashable
+
+
+# hit and miss cost on a long series: python -m logic.memo
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(1)
+    prices = [round(random.uniform(90, 110), 2) for _ in range(1_000_000)]
+    t = time.perf_counter()
+    fp = fingerprint(prices)  # once per series, as the GUI does
+    print(f"fingerprint {(time.perf_counter() - t) * 1000:.1f} ms")
+    for label, fn in (("ema(12)", lambda: ema(prices, 12, fp=fp)),
+                      ("z-score", lambda: z_score_normalisation(prices, fp=fp)),
+                      ("min/max", lambda: recursive_min_max(prices, fp=fp))):
+        t = time.perf_counter()
+        fn()
+        miss = time.perf_counter() - t
+        t = time.perf_counter()
+        fn()
+        hit = time.perf_counter() - t
+        print(f"{label:<8} miss {miss * 1000:7.1f} ms   hit {hit * 1000:6.1f} ms  ({miss / hit:.0f}x)")
+    longer = prices + [100.0]
+    ema(longer, 12)  # the old series' entries are dropped
+    print(cache.stats())
@@ -0,0 +1,192 @@
+# logic/metrics.py
+# Counters and timing histograms for the hot paths (Portfolio I/O, the
+# algorithms, GUI redraws), so a slow machine can show where time goes.
+#
+#     from logic.metrics import timed, timer, count, metrics
+#     @timed()                        # named module.function
+#     def load(...): ...
+#     with timer("gui.redraw"): ...
+#     count("portfolio.rows_loaded", n)
+#     metrics.export("metrics.json")  # or .csv; metrics.report() for a table
+#
+# Timings go into log-spaced buckets (4 per doubling, so percentiles are
+# within ~19%) plus exact count/total/min/max: memory stays constant
+# however many calls are recorded. Set IMS_METRICS_FILE=path to have
+# everything exported when the process exits (GUI or CLI).
+
+import atexit
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+BUCKETS_PER_DOUBLING = 4
+
+
+class Histogram:
+    """Durations in nanoseconds, bucketed by log2."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = {}   # bucket -> count; bucket b holds [2^(b/4), 2^((b+1)/4)) ns
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        b = int(BUCKETS_PER_DOUBLING * math.log2(ns)) if ns > 0 else 0
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (0-100), clamped to min/max."""
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return min(max(2 ** ((b + 1) / BUCKETS_PER_DOUBLING), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """Seconds, like time.perf_counter()."""
+        s = 1e-9
+        return {"count": self.count, "total_s": self.total * s,
+                "mean_s": self.total / self.count * s if self.count else 0.0,
+                "min_s": (self.min or 0) * s, "max_s": self.max * s,
+                "p50_s": self.percentile(50) * s, "p90_s": self.percentile(90) * s,
+                "p99_s": self.percentile(99) * s}
+
+
+class Metrics:
+    """Named counters and timing histograms; thread-safe (jobs run on worker threads)."""
+
+    def __init__(self):
+        self.enabled = True
+        self.counters = {}
+        self.timers = {}
+        self._lock = threading.Lock()
+
+    #  recording
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, ns):
+        with self._lock:
+            hist = self.timers.get(name)
+            if hist is None:
+                hist = self.timers[name] = Histogram()
+            hist.add(ns)
+
+    @contextmanager
+    def timer(self, name):
+        """with metrics.timer("name"): ... records the block's wall time."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter_ns() - start)
+
+    def timed(self, name=None):
+        """Decorator recording every call's wall time (also calls that raise)."""
+        def wrap(fn):
+            label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(label, time.perf_counter_ns() - start)
+            return wrapper
+        return wrap
+
+    #  reading
+    def snapshot(self):
+        with self._lock:
+            return {"counters": dict(self.counters),
+                    "timers": {name: hist.summary() for name, hist in sorted(self.timers.items())}}
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def report(self):
+        """Plain-text table of the timers (microseconds) and counters."""
+        snap = self.snapshot()
+        lines = [f"{'timer (us)':<44}{'calls':>8}{'total':>11}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"]
+        for name, t in sorted(snap["timers"].items(), key=lambda kv: -kv[1]["total_s"]):
+            lines.append(f"{name:<44}{t['count']:>8}" + "".join(
+                f"{t[k] * 1e6:>{w}.1f}" for k, w in (("total_s", 11), ("mean_s", 10), ("p50_s", 10),
+                                                        ("p90_s", 10), ("p99_s", 10), ("max_s", 10))))
+        for name, n in sorted(snap["counters"].items()):
+            lines.append(f"{name:<44}{n:>8}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write a snapshot as JSON, or as CSV (one row per timer/counter) for a .csv path."""
+        snap = self.snapshot()
+        snap["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(path, "w", newline="") as f:
+            if not path.lower().endswith(".csv"):
+                import json
+                json.dump(snap, f, indent=2)
+                return
+            import csv
+            fields = ["kind", "name", "count", "total_s", "mean_s", "min_s", "max_s", "p50_s", "p90_s", "p99_s"]
+            writer = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
+            writer.writeheader()
+            for name, t in snap["timers"].items():
+                writer.writerow({"kind": "timer", "name": name, **t})
+            for name, n in snap["counters"].items():
+                writer.writerow({"kind": "counter", "name": name, "count": n})
+
+
+# one registry for the whole program
+metrics = Metrics()
+timed = metrics.timed
+timer = metrics.timer
+count = metrics.count
+
+if os.environ.get("IMS_METRICS_FILE"):
+    atexit.register(lambda: metrics.export(os.environ["IMS_METRICS_FILE"]))
+
+
+# cost of instrumentation per call: python -m logic.metrics
+if __name__ == "__main__":
+    def bare(x):
+        return x
+
+    wrapped = timed("bench.wrapped")(bare)
+    n = 200_000
+    for label, fn in (("bare call", bare), ("@timed", wrapped)):
+        t = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        print(f"{label:<10} {(time.perf_counter() - t) / n * 1e9:7.0f} ns/call")
+    t = time.perf_counter()
+    for i in range(n):
+        with timer("bench.block"):
+            pass
+    print(f"{'timer()':<10} {(time.perf_counter() - t) / n * 1e9:7.0f} ns/call")
+    print(metrics.report())
@@ -0,0 +1,327 @@
+# logic/pipeline.py
+# Streaming analytics: source -> EMA -> z-score -> min/max -> sinks.
+#
+# Each stage is a generator over chunks, a chunk being a dict of equal
+# length NumPy columns ("time", "price", then whatever stages add). Only
+# one chunk plus a few carried values is alive at a time, so a 10-year
+# minute-by-minute series costs the same memory as a 30-day one.
+#
+#     chunks = pipeline(simulated(100.0, 5_000_000), with_ema(12), with_z_score(), with_min_max())
+#     summary, plot = run(chunks, Summary(), Downsampler(2000))
+
+import csv
+from datetime import datetime
+
+import numpy as np
+
+from logic import indicators
+from logic.montecarlo import simulate_paths
+
+CHUNK = 100_000  # rows per chunk
+
+
+def pipeline(source, *stages):
+    """Chain stages (chunks -> chunks callables) onto a source."""
+    for stage in stages:
+        source = stage(source)
+    return source
+
+
+#  sources
+def simulated(start_price, steps, start_time=None, step=np.timedelta64(1, "m"),
+              seed=None, chunk=CHUNK, **params):
+    """A simulated path of `steps` prices, one every `step`, in chunks (see montecarlo.simulate_paths)."""
+    rng = np.random.default_rng(seed)
+    t0 = np.datetime64(start_time or datetime.now().replace(second=0, microsecond=0), "m")
+    price = float(start_price)
+    for lo in range(0, steps, chunk):
+        n = min(chunk, steps - lo)
+        if lo == 0:
+            prices = simulate_paths(price, n, 1, rng=rng, **params)[0]  # starts at start_price
+        else:
+            prices = simulate_paths(price, n + 1, 1, rng=rng, **params)[0, 1:]  # carry on from the last price
+        price = prices[-1]
+        yield {"time": t0 + np.arange(lo, lo + n) * step, "price": prices, "total": steps}
+
+
+def from_arrays(times, prices, chunk=CHUNK):
+    """Chunks over series already in memory."""
+    times, prices = np.asarray(times), np.asarray(prices, dtype=np.float64)
+    for lo in range(0, len(prices), chunk):
+        yield {"time": times[lo:lo + chunk], "price": prices[lo:lo + chunk], "total": len(prices)}
+
+
+def read_csv(path, time_field="date", price_field="price", chunk=CHUNK):
+    """Chunks of (time, price) read from a CSV file a chunk of lines at a time."""
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        while True:
+            rows = [r for _, r in zip(range(chunk), reader)]
+            if not rows:
+                return
+            yield {"time": np.array([r[time_field] for r in rows], dtype="datetime64[m]"),
+                   "price": np.array([r[price_field] for r in rows], dtype=np.float64)}
+
+
+#  stages
+def with_ema(period, field="price"):
+    """Adds "ema": same values as algorithms.ema over the whole stream (to float rounding)."""
+    def stage(chunks):
+        state = None  # unrounded EMA at the end of the previous chunk
+        for c in chunks:
+            if state is None and len(c[field]) < 2:
+                raise ValueError("Not enough price data for EMA.")
+            raw = indicators.ema(c[field], period, decimals=None, initial=state)
+            state = raw[-1]
+            c["ema"] = np.round(raw, 2)
+            yield c
+    return stage
+
+
+def with_z_score(window=None, field="price"):
+    """Adds "z": each value against everything so far, or against the last `window` values.
+
+    Moments are kept as (count, mean, M2) and combined with Welford/Chan
+    updates, never as raw sums of squares, so a high price level does not
+    cancel the variance away.
+    """
+    def stage(chunks):
+        count, mean, m2 = 0, 0.0, 0.0   # everything so far, for window=None
+        tail = np.zeros(0)              # last window - 1 values, for rolling windows
+        for c in chunks:
+            x = c[field].astype(np.float64)
+            if window is None:
+                size = max(1, int(len(x) ** 0.5))  # ~sqrt(n) blocks of ~sqrt(n) values
+                pm, pq = _block_moments(x, size)
+                blocks = len(pm)
+                before = np.empty((3, blocks))      # moments of everything before each block
+                for b in range(blocks):
+                    before[:, b] = count, mean, m2
+                    count, mean, m2 = _merge(count, mean, m2, size, pm[b, -1], pq[b, -1])
+                i = np.arange(len(x))
+                b, j = i // size, i % size
+                n, mu, q = _merge(before[0, b], before[1, b], before[2, b], j + 1, pm[b, j], pq[b, j])
+                count, mean, m2 = int(n[-1]), float(mu[-1]), float(q[-1])  # drops the block padding
+            else:
+                both = np.concatenate([tail, x])
+                pm, pq = (a.ravel() for a in _block_moments(both, window))
+                sm, sq = (a.ravel() for a in _block_moments(both, window, reverse=True))
+                end = np.arange(len(tail), len(both))       # last index of each window
+                begin = np.maximum(end - window + 1, 0)
+                split = -(-begin // window) * window        # first block boundary in the window
+                n_a = split - begin                         # [begin, split): end of one block
+                a_mean = np.where(n_a > 0, sm[begin], 0.0)
+                a_m2 = np.where(n_a > 0, sq[begin], 0.0)
+                n, mu, q = _merge(n_a, a_mean, a_m2, end - split + 1, pm[end], pq[end])  # + start of the next
+                tail = both[len(both) - window + 1:] if window > 1 else np.zeros(0)
+            std_dev = np.sqrt(np.maximum(q / n, 0.0))
+            c["z"] = np.divide(x - mu, std_dev, out=np.zeros_like(x), where=std_dev > 0)
+            yield c
+    return stage
+
+
+def _block_moments(x, size, reverse=False):
+    """Running (mean, M2) within consecutive blocks of `size` values, as two (blocks, size) arrays.
+
+    One Welford step per position updates every block at once. reverse=True
+    runs each block from its end, giving suffix moments. The last block is
+    padded with the last value; its padded entries are never read.
+    """
+    blocks = -(-len(x) // size)
+    v = np.pad(x, (0, blocks * size - len(x)), mode="edge").reshape(blocks, size).T.copy()  # rows contiguous
+    mean, m2 = np.empty_like(v), np.empty_like(v)
+    mu, q, delta = np.zeros(blocks), np.zeros(blocks), np.empty(blocks)
+    for k, j in enumerate(range(size - 1, -1, -1) if reverse else range(size), start=1):
+        np.subtract(v[j], mu, out=delta)
+        mu += delta / k
+        q += delta * (v[j] - mu)
+        mean[j], m2[j] = mu, q
+    return mean.T, m2.T
+
+
+def _merge(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """(count, mean, M2) of two disjoint groups combined (Chan et al.); n_b must be > 0."""
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * (n_b / n), m2_a + m2_b + delta * delta * (n_a * n_b / n)
+
+
+def with_min_max(field="price"):
+    """Adds running "min" and "max" of everything so far."""
+    def stage(chunks):
+        lo, hi = np.inf, -np.inf
+        for c in chunks:
+            c["min"] = np.minimum.accumulate(np.minimum(c[field], lo))
+            c["max"] = np.maximum.accumulate(np.maximum(c[field], hi))
+            lo, hi = c["min"][-1], c["max"][-1]
+            yield c
+    return stage
+
+
+#  sinks: update(chunk) per chunk, result() at the end
+def run(chunks, *sinks, progress=None):
+    """Feed every chunk to every sink in one pass; returns the sinks' results."""
+    done = 0
+    for c in chunks:
+        for sink in sinks:
+            sink.update(c)
+        done += len(c["price"])
+        if progress is not None:
+            progress(done, c.get("total", 0) or done)
+    return [sink.result() for sink in sinks]
+
+
+class Summary:
+    """Reduces the stream to a few numbers: count, last values, extremes and when they happened."""
+
+    def __init__(self, field="price"):
+        self.field = field
+        self.count = 0
+        self.first_time = self.last = None
+        self.min = self.max = None       # (value, time)
+        self._mean = self._m2 = 0.0      # merged chunk by chunk (Chan et al.)
+
+    def update(self, c):
+        x = c[self.field]
+        n = len(x)
+        if not n:
+            return
+        if self.first_time is None:
+            self.first_time = c["time"][0]
+        lo, hi = int(x.argmin()), int(x.argmax())
+        if self.min is None or x[lo] < self.min[0]:
+            self.min = (float(x[lo]), c["time"][lo])
+        if self.max is None or x[hi] > self.max[0]:
+            self.max = (float(x[hi]), c["time"][hi])
+        mean, m2 = float(x.mean()), float(((x - x.mean()) ** 2).sum())
+        total = self.count + n
+        delta = mean - self._mean
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self._mean += delta * n / total
+        self.count = total
+        self.last = {k: v[-1] for k, v in c.items() if isinstance(v, np.ndarray)}
+
+    def result(self):
+        if not self.count:
+            raise ValueError("No data in stream.")
+        return {"count": self.count, "first_time": str(self.first_time), "last_time": str(self.last["time"]),
+                "mean": self._mean, "std_dev": (self._m2 / self.count) ** 0.5,
+                "min": self.min[0], "min_time": str(self.min[1]),
+                "max": self.max[0], "max_time": str(self.max[1]),
+                "last": {k: (str(v) if k == "time" else float(v)) for k, v in self.last.items()}}
+
+
+class CsvSink:
+    """Writes every row of the chosen columns to a CSV file as it streams past."""
+
+    def __init__(self, path, fields=("time", "price")):
+        self.fields = fields
+        self.rows = 0
+        self._file = open(path, "w", newline="")
+        self._file.write(",".join(fields) + "\n")
+
+    def update(self, c):
+        # numbers never need CSV quoting, so join strings directly (faster than csv.writer)
+        columns = [c[f].astype(str).tolist() if f == "time" else map(repr, c[f].tolist()) for f in self.fields]
+        self._file.write("".join(",".join(row) + "\n" for row in zip(*columns)))
+        self.rows += len(c["price"])
+
+    def result(self):
+        self._file.close()
+        return self.rows
+
+
+class Downsampler:
+    """Keeps the lowest and highest row of each bucket of consecutive rows, for plotting.
+
+    Bucket size doubles whenever more than max_points would be kept, so
+    memory stays O(max_points) however long the stream is, and every peak
+    and trough still shows at pixel resolution.
+    """
+
+    def __init__(self, max_points=2000, field="price"):
+        self.max_points = max(4, int(max_points))
+        self.field = field
+        self.size = 1          # rows per bucket
+        self.buckets = None    # {column: (n buckets, 2) array}, [:, 0] lowest row, [:, 1] highest
+
+    def update(self, c):
+        x = c[self.field]
+        n = len(x)
+        if not n:
+            return
+        starts = np.arange(0, n, self.size)
+        pad = (-n) % self.size  # last bucket of the chunk may be short: pad with its own last row
+        idx = np.concatenate([np.arange(n), np.full(pad, n - 1)]).reshape(-1, self.size)
+        lo = idx[np.arange(len(starts)), x[idx].argmin(axis=1)]
+        hi = idx[np.arange(len(starts)), x[idx].argmax(axis=1)]
+        rows = np.stack([lo, hi], axis=1)
+        new = {k: v[rows] for k, v in c.items() if isinstance(v, np.ndarray)}
+        if self.buckets is None:
+            self.buckets = new
+        else:
+            self.buckets = {k: np.concatenate([self.buckets[k], new[k]]) for k in self.buckets}
+        while len(self.buckets[self.field]) * 2 > self.max_points:
+            self._merge()
+
+    def _merge(self):
+        """Halve the number of buckets by merging neighbours."""
+        b = self.buckets
+        m = len(b[self.field]) // 2 * 2
+        extra = {k: v[m:] for k, v in b.items()}  # odd bucket out stays as it is
+        values = b[self.field][:m].reshape(-1, 4)  # lo, hi of bucket 2i then of 2i + 1
+        pairs = np.arange(len(values))
+        lo = np.where(values[:, 0] <= values[:, 2], 0, 2)
+        hi = np.where(values[:, 1] >= values[:, 3], 1, 3)
+        self.buckets = {k: np.concatenate([np.stack([v[:m].reshape(-1, 4)[pairs, lo],
+                                                     v[:m].reshape(-1, 4)[pairs, hi]], axis=1), extra[k]])
+                        for k, v in b.items()}
+        self.size *= 2
+
+    def result(self):
+        """{column: 1-D array} in time order, at most max_points rows."""
+        if self.buckets is None:
+            return {}
+        order = np.argsort(self.buckets["time"].ravel(), kind="stable")
+        return {k: v.ravel()[order] for k, v in self.buckets.items()}
+
+
+# memory and speed on a 10-year minute series: python -m logic.pipeline
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    import tracemalloc
+    from logic import algorithms
+
+    # the stages agree with the whole-series algorithms
+    x = list(np.round(np.random.default_rng(3).uniform(90, 110, 5000), 2))
+    chunks = pipeline(from_arrays(np.arange(5000), x, chunk=777), with_ema(12), with_z_score(), with_min_max())
+    out = {k: np.concatenate(v) for k, v in zip(("ema", "z", "min"), zip(*[(c["ema"], c["z"], c["min"]) for c in chunks]))}
+    assert np.abs(out["ema"] - algorithms.ema(x, 12)).max() <= 0.01
+    assert np.allclose(out["z"][-1], algorithms.z_score_normalisation(x)[-1])
+    assert np.allclose(next(pipeline(from_arrays(np.arange(5000), x, chunk=5000), with_z_score(window=50)))["z"],
+                       algorithms.rolling_z_score(x, 50))
+    assert out["min"][-1] == min(x)
+
+    # peak memory does not grow with the length of the stream
+    for steps in (100_000, 1_000_000, 5_000_000):
+        tracemalloc.start()
+        run(pipeline(simulated(100.0, steps, seed=1), with_ema(12), with_z_score(window=1440), with_min_max()),
+            Summary(), Downsampler(2000))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{steps:>9,} rows: peak {peak / 1e6:5.1f} MB  (whole lists of 5 columns: ~{steps * 5 * 8 / 1e6:,.0f} MB)")
+
+    steps = 10 * 365 * 24 * 60  # ten years of minutes
+    path = os.path.join(tempfile.mkdtemp(), "stream.csv")
+    for label, sinks in (("summary + plot", lambda: [Summary(), Downsampler(2000)]),
+                         ("+ CSV on disk ", lambda: [Summary(), Downsampler(2000), CsvSink(path, ("time", "price", "ema"))])):
+        t = time.perf_counter()
+        chunks = pipeline(simulated(100.0, steps, "2015-01-01", seed=1, max_pct_change=0.05),
+                          with_ema(12), with_z_score(window=1440), with_min_max())
+        summary, plot, *rows = run(chunks, *sinks())
+        elapsed = time.perf_counter() - t
+        print(f"10 years of minutes, {label}: {elapsed:5.1f} s ({steps / elapsed:>10,.0f} rows/s)")
+    print(f"CSV {os.path.getsize(path) / 1e6:.0f} MB; {len(plot['price'])} plot points; "
+          f"min {summary['min']} at {summary['min_time']}, max {summary['max']} at {summary['max_time']}")
@@ -0,0 +1,406 @@
+# logic/prices.py
+# On-disk store of daily closing prices, keyed by ticker and date.
+#
+# Layout: <root>/<TICKER>/<YEAR>.prc, one partition per ticker and year.
+# A partition is a 16 byte file header followed by chunks of up to
+# CHUNK_ROWS rows, each holding two compressed columns:
+#   header   "<4sIiiII": b"CHNK", rows, first day, last day, dates bytes, closes bytes
+#   dates    int32 days since 1970-01-01, delta-encoded then zlib (daily data
+#            compresses to almost nothing)
+#   closes   float64, byte-shuffled then zlib (the sign/exponent bytes of
+#            similar prices line up and compress well)
+# New rows later than a partition's last date are appended as a new chunk;
+# anything else rewrites that one partition (via a temp file). Only the chunk
+# headers are read to build the in-memory index, so a range read bisects the
+# index and decompresses just the chunks it overlaps. A torn last chunk
+# (crash mid-append) is ignored and overwritten by the next append.
+#
+#     store = PriceStore("data/prices")
+#     store.import_csv("AAPL.csv")                       # date + close columns
+#     dates, closes = store.series("AAPL", "2024-01-01", "2024-12-31")
+
+import csv
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from logic.data_handler import RowError, parse_column
+
+MAGIC = b"NEAPRC\0\0"
+FILE_HEADER = struct.Struct("<8sH")
+FILE_HEADER_SIZE = 16
+VERSION = 1
+CHUNK_HEADER = struct.Struct("<4sIiiII")
+CHUNK_ROWS = 4096
+MAX_CHUNKS = 16     # appended chunks per partition before it is rewritten as one
+CACHE_CHUNKS = 64   # decompressed chunks kept in memory
+
+# where one chunk sits on disk, and the day range it covers
+Chunk = namedtuple("Chunk", ["path", "offset", "rows", "first", "last", "dates_len", "closes_len"])
+
+DATE_COLUMNS = ("date", "timestamp")
+CLOSE_COLUMNS = ("adj close", "adj_close", "close", "price")  # first one present wins
+TICKER_COLUMNS = ("ticker", "symbol")
+
+
+def to_days(values):
+    """Dates (YYYY-MM-DD strings, date objects or datetime64) as int days since 1970."""
+    return np.asarray(values, dtype="datetime64[D]").astype(np.int64)
+
+
+def _day(value):
+    return None if value is None else int(to_days([value])[0])
+
+
+#  column codecs
+def _pack(days, closes):
+    deltas = np.diff(days, prepend=0).astype(np.int32)  # first delta is the first day itself
+    shuffled = np.ascontiguousarray(closes, dtype="<f8").view(np.uint8).reshape(-1, 8).T
+    return zlib.compress(deltas.astype("<i4").tobytes()), zlib.compress(shuffled.tobytes())
+
+
+def _unpack(dates_blob, closes_blob, rows):
+    days = np.cumsum(np.frombuffer(zlib.decompress(dates_blob), dtype="<i4"), dtype=np.int64)
+    raw = np.frombuffer(zlib.decompress(closes_blob), dtype=np.uint8).reshape(8, rows)
+    return days, raw.T.copy().view("<f8").ravel()
+
+
+class PriceStore:
+    """Daily closes per ticker, partitioned by year; see the module comment for the format.
+
+    The index lives in this object, so use one PriceStore per folder.
+    """
+
+    def __init__(self, root="data/prices"):
+        self.root = root
+        self._parts = {}        # ticker -> {year: [Chunk, ...]}, read on first use of the ticker
+        self._ends = {}         # partition path -> end of its last complete chunk
+        self._flat = {}         # ticker -> (firsts, lasts, chunks) over every year, for bisect
+        self._cache = OrderedDict()  # (path, offset) -> (days, closes), least recently used first
+        self._lock = threading.RLock()  # imports run on worker threads
+
+    #  reading
+    def tickers(self):
+        try:
+            return sorted(name for name in os.listdir(self.root)
+                          if os.path.isdir(os.path.join(self.root, name)))
+        except FileNotFoundError:
+            return []
+
+    def series(self, ticker, start=None, end=None):
+        """(dates as datetime64[D], closes) for start <= date <= end (inclusive, either may be None)."""
+        lo, hi = _day(start), _day(end)
+        with self._lock:
+            firsts, lasts, chunks = self._index(ticker.upper())
+            i = 0 if lo is None else bisect_left(lasts, lo)          # first chunk ending at/after start
+            j = len(chunks) if hi is None else bisect_right(firsts, hi)  # chunks starting after end are out
+            parts = [self._read_chunk(c) for c in chunks[i:j]]
+        if not parts:
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0)
+        days = np.concatenate([d for d, _ in parts])
+        closes = np.concatenate([c for _, c in parts])
+        a = 0 if lo is None else int(np.searchsorted(days, lo, side="left"))
+        b = len(days) if hi is None else int(np.searchsorted(days, hi, side="right"))
+        return days[a:b].astype("datetime64[D]"), closes[a:b]
+
+    def latest(self, ticker, on=None):
+        """(date, close) of the last price at or before `on` (default: the last stored), or None."""
+        day = _day(on)
+        with self._lock:
+            firsts, lasts, chunks = self._index(ticker.upper())
+            j = len(chunks) if day is None else bisect_right(firsts, day)
+            if j == 0:
+                return None
+            days, closes = self._read_chunk(chunks[j - 1])  # only the one chunk is decompressed
+        k = len(days) if day is None else int(np.searchsorted(days, day, side="right"))
+        return np.datetime64(int(days[k - 1]), "D").item(), float(closes[k - 1])
+
+    def latest_prices(self, tickers=None, on=None):
+        """{ticker: last close at or before `on`} for the given tickers (default: all stored)."""
+        out = {}
+        for ticker in (self.tickers() if tickers is None else tickers):
+            found = self.latest(ticker, on)
+            if found is not None:
+                out[ticker.upper()] = found[1]
+        return out
+
+    def span(self, ticker):
+        """(first date, last date) stored for ticker, or None."""
+        with self._lock:
+            firsts, lasts, _ = self._index(ticker.upper())
+        if not firsts:
+            return None
+        return np.datetime64(firsts[0], "D").item(), np.datetime64(lasts[-1], "D").item()
+
+    #  writing
+    def append(self, ticker, dates, closes):
+        """Store closes for ticker; a date already stored is overwritten. Returns rows written.
+
+        Rows later than everything stored for their year are appended as a new
+        chunk; earlier or overlapping ones rewrite that year's partition.
+        """
+        ticker = ticker.upper()
+        if not ticker.isalpha():
+            raise ValueError("Ticker must be letters only.")  # also keeps it a safe directory name
+        days = to_days(dates)
+        closes = np.asarray(closes, dtype=np.float64)
+        if days.shape != closes.shape or days.ndim != 1:
+            raise ValueError("Need one close per date.")
+        if not np.all(np.isfinite(closes) & (closes > 0)):
+            raise ValueError("Closes must be numbers greater than 0.")
+        if not len(days):
+            return 0
+        order = np.argsort(days, kind="stable")
+        days, closes = days[order], closes[order]
+        keep = np.append(days[1:] != days[:-1], True)  # last of each repeated date wins
+        days, closes = days[keep], closes[keep]
+
+        years = days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        cuts = np.flatnonzero(np.diff(years)) + 1
+        with self._lock:
+            parts = self._partitions(ticker)
+            os.makedirs(os.path.join(self.root, ticker), exist_ok=True)
+            for d, c in zip(np.split(days, cuts), np.split(closes, cuts)):
+                year = int(years[np.searchsorted(days, d[0])])
+                path = self._path(ticker, year)
+                chunks = parts.get(year, [])
+                if chunks and d[0] <= chunks[-1].last:
+                    old_d, old_c = self._read_partition(chunks)
+                    mine = ~np.isin(old_d, d)  # new values replace stored ones on the same date
+                    d, c = np.concatenate([old_d[mine], d]), np.concatenate([old_c[mine], c])
+                    order = np.argsort(d, kind="stable")
+                    self._write_partition(path, d[order], c[order])
+                elif len(chunks) + -(-len(d) // CHUNK_ROWS) > MAX_CHUNKS:
+                    old_d, old_c = self._read_partition(chunks)
+                    self._write_partition(path, np.concatenate([old_d, d]), np.concatenate([old_c, c]))
+                else:
+                    self._append_chunks(path, d, c)
+                parts[year] = self._scan(path)
+            self._flat.pop(ticker, None)
+        return len(days)
+
+    def compact(self, ticker=None):
+        """Rewrite partitions made of many small appended chunks as full-size chunks."""
+        with self._lock:
+            for t in ([ticker.upper()] if ticker else self.tickers()):
+                parts = self._partitions(t)
+                for year, chunks in parts.items():
+                    if len(chunks) > -(-sum(c.rows for c in chunks) // CHUNK_ROWS):
+                        path = self._path(t, year)
+                        self._write_partition(path, *self._read_partition(chunks))
+                        parts[year] = self._scan(path)
+                self._flat.pop(t, None)
+
+    #  importing
+    def import_csv(self, path, ticker=None):
+        """Import a CSV of daily prices. Returns ({ticker: rows written}, [RowError, ...]).
+
+        Needs a date column and a close column ("Adj Close", "Close" or "price",
+        any case). A ticker/symbol column lets one file hold several tickers;
+        otherwise the ticker is the argument or the file name (AAPL.csv -> AAPL).
+        Rows with a bad date or price are skipped and reported.
+        """
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader, [])]
+            rows = [row for row in reader if row]
+        names = {h: i for i, h in enumerate(header)}
+        date_col = next((names[c] for c in DATE_COLUMNS if c in names), None)
+        close_col = next((names[c] for c in CLOSE_COLUMNS if c in names), None)
+        ticker_col = next((names[c] for c in TICKER_COLUMNS if c in names), None)
+        if date_col is None or close_col is None:
+            raise ValueError(f"{path}: need a date column and a close/price column.")
+        if ticker_col is None:
+            ticker = (ticker or os.path.splitext(os.path.basename(path))[0]).upper()
+
+        errors, good = [], []
+        for line, row in enumerate(rows, start=2):  # header is line 1
+            if len(row) != len(header):
+                errors.append(RowError(line, None, row, "Wrong number of fields."))
+            else:
+                good.append((line, row))
+        lines = [line for line, _ in good]
+        col_dates = np.array([row[date_col].strip()[:10] for _, row in good], dtype=str)
+        col_closes = np.array([row[close_col].strip() for _, row in good], dtype=str)
+        col_tickers = (np.char.upper(np.array([row[ticker_col].strip() for _, row in good], dtype=str))
+                       if ticker_col is not None else np.full(len(good), ticker))
+
+        days, bad_date = parse_column(col_dates, np.datetime64, "datetime64[D]")
+        bad_date |= np.isnat(days)  # empty strings parse as NaT
+        closes, bad_close = parse_column(col_closes, float, np.float64)
+        bad_close |= ~(np.isfinite(closes) & (closes > 0))  # "null", "nan", 0 in vendor files
+        bad_ticker = ~np.char.isalpha(col_tickers)
+        for field, column, bad, message in (("date", col_dates, bad_date, "Date must be YYYY-MM-DD."),
+                                            ("price", col_closes, bad_close, "Price must be a number greater than 0."),
+                                            ("ticker", col_tickers, bad_ticker, "Ticker must be letters only.")):
+            errors.extend(RowError(lines[i], field, str(column[i]), message) for i in np.flatnonzero(bad))
+        errors.sort(key=lambda e: e.line)
+
+        valid = ~(bad_date | bad_close | bad_ticker)
+        written = {}
+        for t in np.unique(col_tickers[valid]):
+            mine = valid & (col_tickers == t)
+            written[str(t)] = self.append(str(t), days[mine], closes[mine])
+        return written, errors
+
+    def import_folder(self, folder):
+        """import_csv every *.csv in folder; returns ({ticker: rows written}, {file: [RowError, ...]})."""
+        written, errors = {}, {}
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".csv"):
+                counts, bad = self.import_csv(os.path.join(folder, name))
+                for t, n in counts.items():
+                    written[t] = written.get(t, 0) + n
+                if bad:
+                    errors[name] = bad
+        return written, errors
+
+    #  index
+    def _path(self, ticker, year):
+        return os.path.join(self.root, ticker, f"{year}.prc")
+
+    def _partitions(self, ticker):
+        parts = self._parts.get(ticker)
+        if parts is None:
+            parts = self._parts[ticker] = {}
+            try:
+                names = os.listdir(os.path.join(self.root, ticker))
+            except FileNotFoundError:
+                names = []
+            for name in names:
+                stem, ext = os.path.splitext(name)
+                if ext == ".prc" and stem.isdigit():
+                    parts[int(stem)] = self._scan(self._path(ticker, int(stem)))
+        return parts
+
+    def _index(self, ticker):
+        """(first days, last days, chunks) over all of ticker's years, in date order."""
+        flat = self._flat.get(ticker)
+        if flat is None:
+            parts = self._partitions(ticker)
+            chunks = [c for year in sorted(parts) for c in parts[year]]
+            flat = self._flat[ticker] = ([c.first for c in chunks], [c.last for c in chunks], chunks)
+        return flat
+
+    def _scan(self, path):
+        """Chunks of one partition from their headers; stops at a torn tail."""
+        chunks = []
+        end = FILE_HEADER_SIZE
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return chunks
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size).ljust(FILE_HEADER.size, b"\0"))
+            if magic != MAGIC or version > VERSION:
+                raise ValueError(f"{path} is not a price partition (or is from a newer version).")
+            f.seek(end)
+            while True:
+                head = f.read(CHUNK_HEADER.size)
+                if len(head) < CHUNK_HEADER.size:
+                    break
+                tag, rows, first, last, dates_len, closes_len = CHUNK_HEADER.unpack(head)
+                stop = end + CHUNK_HEADER.size + dates_len + closes_len
+                if tag != b"CHNK" or stop > size:
+                    break  # torn write from a crash
+                chunks.append(Chunk(path, end, rows, first, last, dates_len, closes_len))
+                end = stop
+                f.seek(end)
+        self._ends[path] = end
+        return chunks
+
+    #  chunk I/O
+    def _read_chunk(self, chunk):
+        key = (chunk.path, chunk.offset)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        with open(chunk.path, "rb") as f:
+            f.seek(chunk.offset + CHUNK_HEADER.size)
+            dates_blob = f.read(chunk.dates_len)
+            closes_blob = f.read(chunk.closes_len)
+        value = self._cache[key] = _unpack(dates_blob, closes_blob, chunk.rows)
+        if len(self._cache) > CACHE_CHUNKS:
+            self._cache.popitem(last=False)
+        return value
+
+    def _read_partition(self, chunks):
+        parts = [self._read_chunk(c) for c in chunks]
+        return np.concatenate([d for d, _ in parts]), np.concatenate([c for _, c in parts])
+
+    def _chunk_bytes(self, days, closes):
+        out = []
+        for lo in range(0, len(days), CHUNK_ROWS):
+            d, c = days[lo:lo + CHUNK_ROWS], closes[lo:lo + CHUNK_ROWS]
+            dates_blob, closes_blob = _pack(d, c)
+            out.append(CHUNK_HEADER.pack(b"CHNK", len(d), int(d[0]), int(d[-1]), len(dates_blob), len(closes_blob)))
+            out.append(dates_blob)
+            out.append(closes_blob)
+        return b"".join(out)
+
+    def _append_chunks(self, path, days, closes):
+        if not os.path.exists(path):
+            self._write_partition(path, days, closes)
+            return
+        with open(path, "r+b") as f:
+            f.seek(self._ends[path])
+            f.truncate()  # drop a torn chunk left by a crash
+            f.write(self._chunk_bytes(days, closes))
+
+    def _write_partition(self, path, days, closes):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION).ljust(FILE_HEADER_SIZE, b"\0"))
+            f.write(self._chunk_bytes(days, closes))
+        os.replace(tmp, path)
+        for key in [k for k in self._cache if k[0] == path]:
+            del self._cache[key]  # offsets in the new file mean different chunks
+
+
+# size and read speed for 100 tickers x 20 years: python -m logic.prices
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    import time
+
+    root = tempfile.mkdtemp()
+    try:
+        store = PriceStore(root)
+        rng = np.random.default_rng(1)
+        days = np.arange(np.datetime64("2005-01-03"), np.datetime64("2025-01-01"))
+        days = days[np.is_busday(days)]
+        t = time.perf_counter()
+        for k in range(100):
+            closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days)))), 2)
+            store.append("T" + chr(65 + k // 26) + chr(65 + k % 26), days, closes)
+        elapsed = time.perf_counter() - t
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(root) for f in fs)
+        print(f"wrote {100 * len(days):,} rows in {elapsed:.2f} s; {size / 1024:.0f} KiB on disk "
+              f"({size / (100 * len(days)):.1f} bytes/row, raw 12 bytes/row)")
+
+        cold = PriceStore(root)
+        t = time.perf_counter()
+        d, c = cold.series("TAA", "2015-03-01", "2015-06-30")
+        print(f"cold 4-month range read: {len(d)} rows in {(time.perf_counter() - t) * 1000:.2f} ms")
+        t = time.perf_counter()
+        for _ in range(1000):
+            cold.series("TAA", "2015-03-01", "2015-06-30")
+        print(f"warm 4-month range read: {(time.perf_counter() - t):.3f} ms each")
+        t = time.perf_counter()
+        prices = cold.latest_prices()
+        print(f"latest close of {len(prices)} tickers (index scan + one chunk each): "
+              f"{(time.perf_counter() - t) * 1000:.1f} ms")
+        t = time.perf_counter()
+        for i in range(250):
+            store.append("TAA", [np.datetime64("2025-01-01") + i], [100.0 + i])
+        print(f"250 one-row appends: {(time.perf_counter() - t) * 1000:.0f} ms, "
+              f"{len(store._partitions('TAA')[2025])} chunk(s) in the 2025 partition")
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,231 @@
+# logic/snapshot.py
+# Binary portfolio snapshot, read through mmap so opening is near-instant.
+#
+# Layout (little-endian):
+#   header   64 bytes  magic, version, record size, record count, string table offset/length
+#   records  count * record size, fixed width (see RECORD_DTYPES)
+#   strings  UTF-8 JSON {"tickers": [...], "asset_types": [...], "odd_dates": [...],
+#            "journal_lsn": last journal seq folded in, "next_id": next lot id}
+# Records hold int codes into the string tables and dates as ordinals,
+# the same encoding as logic/store.ColumnStore.
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import date as _date
+
+import numpy as np
+
+from logic.store import StringTable
+
+MAGIC = b"NEASNAP\0"
+HEADER = struct.Struct("<8sHHQQQ")
+HEADER_SIZE = 64
+VERSION = 3
+
+# new fields are only ever appended, so older layouts stay readable
+RECORD_DTYPES = {
+    1: np.dtype([("price", "<f8"), ("quantity", "<i8"), ("ticker", "<i4"), ("date", "<i4")]),
+    2: np.dtype([("price", "<f8"), ("quantity", "<i8"), ("ticker", "<i4"), ("date", "<i4"),
+                 ("asset_type", "<i4"), ("_pad", "<i4")]),  # asset_type column added
+    3: np.dtype([("price", "<f8"), ("quantity", "<i8"), ("ticker", "<i4"), ("date", "<i4"),
+                 ("asset_type", "<i4"), ("_pad", "<i4"), ("id", "<i8")]),  # stable lot ids
+}
+
+
+def write_snapshot(store, path, journal_lsn=0):
+    """Write the live lots of a ColumnStore to path (via a temp file, so a crash never leaves half a snapshot)."""
+    dtype = RECORD_DTYPES[VERSION]
+    n = len(store)
+    records = np.zeros(n, dtype=dtype)
+    if n:
+        live = np.frombuffer(store.alive, dtype=np.uint8).astype(bool)  # skip tombstones
+        records["price"] = np.frombuffer(store.price, dtype=np.float64)[live]
+        records["quantity"] = np.frombuffer(store.quantity, dtype=np.int64)[live]
+        records["ticker"] = np.frombuffer(store.ticker_code, dtype=np.intc)[live]
+        records["date"] = np.frombuffer(store.date_ord, dtype=np.intc)[live]
+        records["asset_type"] = np.frombuffer(store.asset_code, dtype=np.intc)[live]
+        records["id"] = np.frombuffer(store.ids, dtype=np.int64)[live]
+    strings = json.dumps({"tickers": store.tickers.strings,
+                          "asset_types": store.asset_types.strings,
+                          "odd_dates": store.odd_dates.strings,
+                          "journal_lsn": journal_lsn,
+                          "next_id": store.next_id}).encode("utf-8")
+    strings_offset = HEADER_SIZE + records.nbytes
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, dtype.itemsize, n, strings_offset, len(strings)).ljust(HEADER_SIZE, b"\0"))
+        f.write(records.tobytes())
+        f.write(strings)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """Read-only mmap view of a snapshot file; pages are only read when rows are touched."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a portfolio snapshot.")
+        self.records = None
+        try:
+            magic, version, record_size, count, strings_offset, strings_length = HEADER.unpack_from(self._mm)
+        except struct.error:  # shorter than a header
+            self.close()
+            raise ValueError(f"{path} is not a portfolio snapshot.")
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a portfolio snapshot.")
+        if version not in RECORD_DTYPES or RECORD_DTYPES[version].itemsize != record_size:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        if strings_offset != HEADER_SIZE + count * record_size or strings_offset + strings_length > len(self._mm):
+            self.close()
+            raise ValueError(f"{path} is truncated or corrupt.")
+        self.version = version
+        self.records = np.frombuffer(self._mm, dtype=RECORD_DTYPES[version], count=count, offset=HEADER_SIZE)
+        try:
+            tables = json.loads(self._mm[strings_offset:strings_offset + strings_length].decode("utf-8"))
+            self.tickers = tables["tickers"]
+        except (ValueError, KeyError, TypeError):
+            self.close()
+            raise ValueError(f"{path} is truncated or corrupt.")
+        self.asset_types = tables.get("asset_types", [])
+        self.odd_dates = tables.get("odd_dates", [])
+        self.journal_lsn = tables.get("journal_lsn", 0)
+        self.next_id = tables.get("next_id", len(self) + 1)
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, field):
+        """Zero-copy NumPy view of one field, filled in for fields older versions lack:
+        asset_type is all "Unknown" before version 2, ids count from 1 before version 3."""
+        if field == "asset_type" and self.version < 2:
+            return np.zeros(len(self), dtype=np.intc)
+        if field == "id" and self.version < 3:
+            return np.arange(1, len(self) + 1, dtype=np.int64)
+        return self.records[field]
+
+    def row(self, i):
+        """Return (ticker, price, quantity, date, asset_type) for row i."""
+        rec = self.records[i]
+        date = int(rec["date"])
+        date = _date.fromordinal(date).isoformat() if date > 0 else self.odd_dates[-date - 1]
+        asset_type = self.asset_types[rec["asset_type"]] if self.version >= 2 else "Unknown"
+        return self.tickers[rec["ticker"]], float(rec["price"]), int(rec["quantity"]), date, asset_type
+
+    def fill_store(self, store):
+        """Copy every record into a (cleared) ColumnStore, one copy per column."""
+        store.clear()
+        store.tickers = _table(self.tickers)
+        store.odd_dates = _table(self.odd_dates)
+        store.asset_types = _table(self.asset_types if self.version >= 2 else ["Unknown"])
+        n = len(self)
+        for name, field in (("price", "price"), ("quantity", "quantity"), ("ticker_code", "ticker"),
+                            ("date_ord", "date"), ("asset_code", "asset_type"), ("ids", "id")):
+            column = array(getattr(store, name).typecode, [0]) * n  # sized up front, no temporaries
+            np.frombuffer(column, dtype=np.dtype(column.typecode))[:] = self.column(field)  # straight from the mmap
+            setattr(store, name, column)
+        if n:
+            store._map_ids(0)
+        store.next_id = max(store.next_id, self.next_id)
+
+    def close(self):
+        self.records = None  # drop the view before unmapping
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _table(strings):
+    table = StringTable()
+    for s in strings:
+        table.code(s)
+    return table
+
+
+def snapshot_is_current(snapshot_path, csv_path):
+    """True if the snapshot exists and is at least as new as the CSV it mirrors."""
+    try:
+        snap_time = os.path.getmtime(snapshot_path)
+    except OSError:
+        return False
+    try:
+        return snap_time >= os.path.getmtime(csv_path)
+    except OSError:
+        return True  # no CSV, the snapshot is all there is
+
+
+def csv_to_snapshot(csv_path, snapshot_path):
+    """Import a CSV in the data/investments.csv schema; returns the RowErrors skipped."""
+    from logic.data_handler import Portfolio
+    pf = Portfolio()
+    errors = pf.load_csv_bulk(csv_path)
+    pf.save_snapshot(snapshot_path)
+    return errors
+
+
+def snapshot_to_csv(snapshot_path, csv_path):
+    """Export a snapshot back to the data/investments.csv schema."""
+    from logic.data_handler import Portfolio
+    pf = Portfolio()
+    pf.load_snapshot(snapshot_path)
+    pf.save_csv(csv_path)
+
+
+# startup benchmark, CSV against snapshot: python -m logic.snapshot
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+    from logic.data_handler import Portfolio
+
+    random.seed(1)
+    n = 500_000
+    folder = tempfile.mkdtemp()
+    csv_path, snap_path = os.path.join(folder, "bench.csv"), os.path.join(folder, "bench.snap")
+    pf = Portfolio()
+    pf._store.extend_columns(
+        [random.choice(["AAPL", "TSLA", "MSFT", "BTC"]) for _ in range(n)],
+        [round(random.uniform(1, 500), 2) for _ in range(n)],
+        [random.randint(1, 100) for _ in range(n)],
+        [f"2025-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}" for _ in range(n)],
+        [random.choice(["Stock", "Crypto"]) for _ in range(n)])
+    pf.save_csv(csv_path)
+    pf.save_snapshot(snap_path)
+
+    t = time.perf_counter()
+    Portfolio().load_csv_bulk(csv_path)
+    csv_time = time.perf_counter() - t
+    t = time.perf_counter()
+    with Snapshot(snap_path) as snap:
+        first = snap.row(0)
+    open_time = time.perf_counter() - t
+    t = time.perf_counter()
+    loaded = Portfolio()
+    loaded.load_snapshot(snap_path)
+    load_time = time.perf_counter() - t
+
+    loaded.save_csv(os.path.join(folder, "round_trip.csv"))
+    with open(csv_path) as a, open(os.path.join(folder, "round_trip.csv")) as b:
+        same = a.read() == b.read()
+    print(f"{n:,} lots, snapshot {os.path.getsize(snap_path) / 1e6:.1f} MB, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB")
+    print(f"load_csv_bulk:  {csv_time * 1000:8.1f} ms")
+    print(f"open snapshot:  {open_time * 1000:8.1f} ms  (mmap, first row {first})")
+    print(f"load_snapshot:  {load_time * 1000:8.1f} ms")
+    print(f"CSV round trip identical: {same}")
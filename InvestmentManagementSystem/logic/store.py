@@ -0,0 +1,400 @@
+# logic/store.py
+# Columnar storage behind Portfolio: one typed array per field instead of
+# one Python object (and __dict__) per lot. Tickers and asset types are
+# interned to int codes, dates are kept as ordinal ints.
+
+from array import array
+from datetime import date as _date
+from itertools import compress
+
+from logic.index import StoreIndex
+
+FIELDS = ("ticker", "price", "quantity", "date", "asset_type")
+
+
+class StringTable:
+    """Interns repeated strings (tickers, asset types) to small int codes."""
+
+    def __init__(self):
+        self.strings = []   # code -> string
+        self.codes = {}     # string -> code
+
+    def code(self, text):
+        c = self.codes.get(text)
+        if c is None:
+            c = self.codes[text] = len(self.strings)
+            self.strings.append(text)
+        return c
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class ColumnStore:
+    """Parallel typed arrays, one row per investment lot.
+
+    Every lot has a stable id (from 1). Deleting only tombstones the row, so
+    ids and other rows stay put; vacuum() squeezes tombstones out once they
+    pile up. row_of maps id -> physical row (-1 once deleted).
+    """
+
+    VACUUM_MIN = 1024  # tombstones tolerated before an automatic vacuum
+
+    def __init__(self):
+        self.tickers = StringTable()
+        self.asset_types = StringTable()
+        self.odd_dates = StringTable()  # dates that are not plain YYYY-MM-DD
+        self.index = StoreIndex(self)   # ticker/asset type/date lookups
+        self.next_id = 1                # never reused, even across clear()
+        self.clear()
+
+    def clear(self):
+        self.price = array("d")
+        self.quantity = array("q")
+        self.ticker_code = array("i")
+        self.asset_code = array("i")
+        self.date_ord = array("i")      # date.toordinal(), or -(odd_dates code + 1)
+        self.ids = array("q")
+        self.alive = bytearray()        # 1 per row, 0 once tombstoned
+        self.dead = 0
+        self.row_of = array("q", [-1]) * self.next_id
+        self._live = None               # cached live row numbers, see live_row
+        self.index.invalidate()
+
+    def __len__(self):
+        return len(self.price) - self.dead  # live lots
+
+    @property
+    def nrows(self):
+        return len(self.price)  # physical rows, tombstones included
+
+    #  date encoding
+    def encode_date(self, text):
+        try:
+            d = _date.fromisoformat(text)
+            if d.isoformat() == text:  # only if it round-trips exactly
+                return d.toordinal()
+        except (TypeError, ValueError):
+            pass
+        return -(self.odd_dates.code(text) + 1)
+
+    def decode_date(self, ordinal):
+        if ordinal > 0:
+            return _date.fromordinal(ordinal).isoformat()
+        return self.odd_dates[-ordinal - 1]
+
+    #  ids
+    def row_for_id(self, inv_id):
+        row = self.row_of[inv_id] if 0 < inv_id < len(self.row_of) else -1
+        if row < 0:
+            raise KeyError(f"No investment with id {inv_id}.")
+        return row
+
+    def live_row(self, position):
+        """Physical row of the position-th live lot."""
+        if not self.dead:
+            return position
+        if self._live is None:
+            self._live = [r for r, a in enumerate(self.alive) if a]
+        return self._live[position]
+
+    def live_rows(self):
+        if not self.dead:
+            return range(len(self.price))
+        return compress(range(len(self.price)), self.alive)
+
+    def _register_ids(self, first_row, ids):
+        """Record ids (NumPy int array) for the rows appended from first_row on."""
+        import numpy as np
+        self.ids.frombytes(np.asarray(ids, dtype=np.int64).tobytes())
+        self._map_ids(first_row)
+
+    def _map_ids(self, first_row):
+        """Mark the rows from first_row on (ids already in self.ids) alive and point row_of at them."""
+        import numpy as np
+        ids = np.frombuffer(self.ids, dtype=np.int64)[first_row:]
+        n = len(ids)
+        self.alive.extend(b"\x01" * n)
+        self.next_id = max(self.next_id, int(ids.max()) + 1)
+        self.row_of.extend(array("q", [-1]) * (self.next_id - len(self.row_of)))
+        row_of = np.frombuffer(self.row_of, dtype=np.int64)  # writable view
+        row_of[ids] = np.arange(first_row, first_row + n)
+        del row_of, ids  # release the buffers so the arrays can grow again
+        self._live = None
+
+    #  rows
+    def append(self, ticker, price, quantity, date, asset_type, inv_id=None):
+        """Add one lot and return its id (a new one unless inv_id is given, e.g. on replay)."""
+        if inv_id is None:
+            inv_id = self.next_id
+        self.price.append(float(price))
+        self.quantity.append(int(quantity))
+        self.ticker_code.append(self.tickers.code(ticker))
+        self.asset_code.append(self.asset_types.code(asset_type))
+        self.date_ord.append(self.encode_date(date))
+        self.ids.append(inv_id)
+        self.alive.append(1)
+        if inv_id >= self.next_id:
+            self.next_id = inv_id + 1
+            self.row_of.extend([-1] * (self.next_id - len(self.row_of)))
+        row = len(self.price) - 1
+        self.row_of[inv_id] = row
+        if self._live is not None:
+            self._live.append(row)
+        self.index.add(row)
+        return inv_id
+
+    def extend_columns(self, tickers, prices, quantities, dates, asset_types, first_id=None):
+        """Append whole NumPy columns at once; strings are interned per unique value.
+
+        Lots get consecutive ids from first_id (default next_id); returns the first id.
+        """
+        import numpy as np
+        n = len(prices)
+        if first_id is None:
+            first_id = self.next_id
+        if not n:
+            return first_id
+        first_row = len(self.price)
+        self.price.frombytes(np.asarray(prices, dtype=np.float64).tobytes())
+        self.quantity.frombytes(np.asarray(quantities, dtype=np.int64).tobytes())
+        for column, encode, target in ((tickers, self.tickers.code, self.ticker_code),
+                                       (asset_types, self.asset_types.code, self.asset_code),
+                                       (dates, self.encode_date, self.date_ord)):
+            uniq, inverse = np.unique(column, return_inverse=True)
+            codes = np.array([encode(str(u)) for u in uniq], dtype=np.intc)
+            target.frombytes(codes[inverse.ravel()].tobytes())
+        self._register_ids(first_row, np.arange(first_id, first_id + n))
+        if self.index.built and n * 8 < first_row:
+            for row in range(first_row, first_row + n):
+                self.index.add(row)  # small batch: cheaper than a rebuild
+        else:
+            self.index.invalidate()  # cheaper to rebuild once than to insert row by row
+        return first_id
+
+    def iter_rows(self):
+        """Yield (ticker, price, quantity, date, asset_type) for live lots, decoding each code once."""
+        dates = {o: self.decode_date(o) for o in set(self.date_ord)}
+        rows = zip(map(self.tickers.strings.__getitem__, self.ticker_code),
+                   self.price, self.quantity,
+                   map(dates.__getitem__, self.date_ord),
+                   map(self.asset_types.strings.__getitem__, self.asset_code))
+        return compress(rows, self.alive) if self.dead else rows
+
+    def row(self, i):
+        """Return (ticker, price, quantity, date, asset_type) for row i."""
+        return (self.tickers[self.ticker_code[i]], self.price[i], self.quantity[i],
+                self.decode_date(self.date_ord[i]), self.asset_types[self.asset_code[i]])
+
+    def delete(self, i):
+        """Tombstone row i in O(1) and return its values; nothing else moves."""
+        values = self.row(i)
+        self.index.remove(i)
+        self.alive[i] = 0
+        self.dead += 1
+        self.row_of[self.ids[i]] = -1
+        self._live = None
+        if self.dead >= self.VACUUM_MIN and self.dead * 2 >= len(self.price):
+            self.vacuum()  # amortised: at least half the rows go in one pass
+        return values
+
+    def vacuum(self):
+        """Drop tombstoned rows in one vectorized pass; ids are unchanged."""
+        import numpy as np
+        if not self.dead:
+            return
+        keep = np.frombuffer(self.alive, dtype=np.uint8).astype(bool)
+        for name, dtype in (("price", np.float64), ("quantity", np.int64), ("ticker_code", np.intc),
+                            ("asset_code", np.intc), ("date_ord", np.intc), ("ids", np.int64)):
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, np.frombuffer(col, dtype=dtype)[keep].tobytes()))
+        n = len(self.price)
+        self.alive = bytearray(b"\x01") * n
+        self.dead = 0
+        row_of = np.full(len(self.row_of), -1, dtype=np.int64)
+        row_of[np.frombuffer(self.ids, dtype=np.int64)] = np.arange(n)
+        self.row_of = array("q", row_of.tobytes())
+        self._live = None
+        self.index.invalidate()
+
+    def get_field(self, i, field):
+        if field == "ticker":
+            return self.tickers[self.ticker_code[i]]
+        if field == "price":
+            return self.price[i]
+        if field == "quantity":
+            return self.quantity[i]
+        if field == "date":
+            return self.decode_date(self.date_ord[i])
+        if field == "asset_type":
+            return self.asset_types[self.asset_code[i]]
+        raise AttributeError(field)
+
+    def set_field(self, i, field, value):
+        if field in ("ticker", "date", "asset_type"):
+            self.index.remove(i)
+            self._set_field(i, field, value)
+            self.index.add(i)
+        else:
+            self._set_field(i, field, value)
+
+    def _set_field(self, i, field, value):
+        if field == "ticker":
+            self.ticker_code[i] = self.tickers.code(value)
+        elif field == "price":
+            self.price[i] = float(value)
+        elif field == "quantity":
+            self.quantity[i] = int(value)
+        elif field == "date":
+            self.date_ord[i] = self.encode_date(value)
+        elif field == "asset_type":
+            self.asset_code[i] = self.asset_types.code(value)
+        else:
+            raise AttributeError(field)
+
+    #  vectorized aggregates
+    # numpy is only imported when totals are asked for; frombuffer views
+    # share memory with the arrays, so they stay local to each call.
+    def values(self):
+        """price * quantity for every physical row (0 for tombstones) as a NumPy array."""
+        import numpy as np
+        if not self.nrows:
+            return np.zeros(0)
+        price = np.frombuffer(self.price, dtype=np.float64)
+        qty = np.frombuffer(self.quantity, dtype=np.int64)
+        if self.dead:
+            return price * qty * np.frombuffer(self.alive, dtype=np.uint8)
+        return price * qty
+
+    def total_value(self):
+        return float(self.values().sum())
+
+    def totals_by(self, field, measure="value"):
+        """Sum of price * quantity (or of quantity) grouped by "ticker" or "asset_type"."""
+        import numpy as np
+        if field == "ticker":
+            codes, table = self.ticker_code, self.tickers
+        elif field == "asset_type":
+            codes, table = self.asset_code, self.asset_types
+        else:
+            raise ValueError("Can only group by ticker or asset_type.")
+        if not len(self):
+            return {}
+        code_arr = np.frombuffer(codes, dtype=np.dtype(f"i{codes.itemsize}"))
+        if measure == "value":
+            weights = self.values()
+        elif measure == "quantity":
+            weights = np.frombuffer(self.quantity, dtype=np.int64).astype(np.float64)
+            if self.dead:
+                weights *= np.frombuffer(self.alive, dtype=np.uint8)
+        else:
+            raise ValueError("Can only total value or quantity.")
+        sums = np.bincount(code_arr, weights=weights, minlength=len(table))
+        alive = np.frombuffer(self.alive, dtype=np.uint8) if self.dead else None
+        counts = np.bincount(code_arr, weights=alive, minlength=len(table))
+        return {table[c]: float(sums[c]) for c in np.flatnonzero(counts)}
+
+    def order_rows(self, rows, field, descending=False):
+        """Sort physical rows (NumPy int array) by field or "value"; ties keep row order."""
+        import numpy as np
+        rows = np.asarray(rows, dtype=np.int64)
+        if field in ("ticker", "asset_type"):
+            codes, table = (self.ticker_code, self.tickers) if field == "ticker" else (self.asset_code, self.asset_types)
+            rank = np.empty(len(table), dtype=np.int64)  # code -> alphabetical position
+            rank[sorted(range(len(table)), key=table.strings.__getitem__)] = np.arange(len(table))
+            key = rank[np.frombuffer(codes, dtype=np.intc)[rows]]
+        elif field == "date":
+            key = np.frombuffer(self.date_ord, dtype=np.intc)[rows].astype(np.int64)
+            key[key < 0] = np.iinfo(np.int64).max // 2  # odd dates sort after real ones
+        elif field == "price":
+            key = np.frombuffer(self.price, dtype=np.float64)[rows]
+        elif field == "quantity":
+            key = np.frombuffer(self.quantity, dtype=np.int64)[rows]
+        elif field == "value":
+            key = self.values()[rows]
+        else:
+            raise ValueError(f"Cannot sort by {field}.")
+        return rows[np.argsort(-key if descending else key, kind="stable")]
+
+
+# memory, aggregation and CSV throughput benchmarks: python -m logic.store
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+    from logic.data_handler import Portfolio
+
+    class ListInvestment:  # the old one-object-per-lot layout
+        def __init__(self, ticker, price, quantity, date, asset_type="Unknown"):
+            self.ticker = ticker.upper()
+            self.price = float(price)
+            self.quantity = int(quantity)
+            self.date = date
+            self.asset_type = asset_type
+
+    random.seed(1)
+    n = 1_000_000
+    tickers = ["AAPL", "TSLA", "MSFT", "AMZN", "GOOG", "NVDA", "BTC", "ETH"]
+    kinds = ["Stock", "ETF", "Crypto", "Bond", "Other"]
+    rows = [(random.choice(tickers), round(random.uniform(1, 500), 2), random.randint(1, 100),
+             f"2025-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}", random.choice(kinds))
+            for _ in range(n)]
+
+    tracemalloc.start()
+    items = [ListInvestment(*r) for r in rows]
+    old_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    pf = Portfolio()
+    for r in rows:
+        pf._store.append(*r)
+    new_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t = time.perf_counter()
+    old_total = sum(inv.price * inv.quantity for inv in items)
+    by_ticker = {}
+    for inv in items:
+        by_ticker[inv.ticker] = by_ticker.get(inv.ticker, 0.0) + inv.price * inv.quantity
+    old_time = time.perf_counter() - t
+
+    t = time.perf_counter()
+    new_total = pf.total_value()
+    new_by_ticker = pf.totals_by("ticker")
+    new_time = time.perf_counter() - t
+
+    print(f"{n:,} lots")
+    print(f"list of objects: {old_mem / 1e6:7.1f} MB, totals {old_time * 1000:7.1f} ms")
+    print(f"columnar:        {new_mem / 1e6:7.1f} MB, totals {new_time * 1000:7.1f} ms")
+    print(f"totals agree: {abs(old_total - new_total) < 1e-6 * old_total and by_ticker.keys() == new_by_ticker.keys()}")
+
+    # CSV: per-row load_csv against the column-wise bulk path
+    import contextlib
+    import io
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "bench.csv")
+    n_csv = 200_000
+    pf = Portfolio()
+    pf._store.extend_columns(*[[r[i] for r in rows[:n_csv]] for i in range(5)])
+
+    t = time.perf_counter()
+    pf.save_csv(path)
+    save_time = time.perf_counter() - t
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # load_csv prints every row
+        Portfolio().load_csv(path)
+    row_time = time.perf_counter() - t
+    t = time.perf_counter()
+    bulk = Portfolio()
+    errors = bulk.load_csv_bulk(path)
+    bulk_time = time.perf_counter() - t
+
+    print(f"\nCSV, {n_csv:,} rows")
+    print(f"save_csv:      {n_csv / save_time:12,.0f} rows/s")
+    print(f"load_csv:      {n_csv / row_time:12,.0f} rows/s")
+    print(f"load_csv_bulk: {n_csv / bulk_time:12,.0f} rows/s  ({len(errors)} errors, {len(bulk.items):,} rows)")
@@ -0,0 +1,166 @@
+# logic/tasks.py
+# Runs long computations off the calling thread (e.g. the Tk main loop).
+#
+# Tasks are named; submitting a new task under a name that is still
+# running supersedes the old one, whose result is then never delivered.
+# Results, errors and progress are queued and handed to their callbacks
+# by poll(), on whichever thread calls it, so a GUI can poll from
+# root.after and touch widgets safely. Headless code can just call
+# Task.result() or map() on the same executor.
+
+import inspect
+import queue
+import sys
+import time
+import traceback
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+from logic.metrics import metrics, count
+
+
+class TaskCancelled(Exception):
+    """Raised inside a job (from its progress callback) once the task is cancelled."""
+
+
+class Task:
+    def __init__(self, name, on_done=None, on_error=None, on_progress=None):
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancelled = False
+        self.progress = 0.0   # fraction done, as last reported by the job
+        self.future = None
+        self._events = None   # executor queue, set on submit
+
+    def report(self, done, total):
+        """Progress callback handed to jobs as progress=; also where cancellation takes effect."""
+        if self.cancelled:
+            raise TaskCancelled(self.name)
+        fraction = done / total if total else 1.0
+        if fraction - self.progress >= 0.01 or fraction >= 1.0:  # ~100 updates at most
+            self.progress = fraction
+            if self.on_progress is not None:
+                self._events.put(("progress", self))
+
+    def cancel(self):
+        """Stop the task if it hasn't started, or at its next progress report if it has."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """Block until the job finishes (headless use); raises what the job raised."""
+        return self.future.result(timeout)
+
+
+class TaskExecutor:
+    """Thread (default) or process pool running named tasks.
+
+    Jobs with a progress parameter get Task.report passed in. With
+    processes=True jobs must be picklable module-level functions and can
+    only be cancelled before they start, since report() can't cross the
+    process boundary.
+    """
+
+    def __init__(self, workers=2, processes=False):
+        self.processes = processes
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._pool = pool(max_workers=workers)
+        self._events = queue.Queue()  # ("done" | "progress", task) for poll()
+        self._running = {}            # name -> latest Task
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool, superseding any task already running as name.
+
+        The time from submit to finish is recorded as the metrics timer "tasks.<name>".
+        """
+        self.cancel(name)
+        count("tasks.submitted")
+        start = time.perf_counter_ns()
+        task = Task(name, on_done, on_error, on_progress)
+        task._events = self._events
+        if not self.processes and _takes_progress(fn):
+            kwargs["progress"] = task.report
+        self._running[name] = task
+        task.future = self._pool.submit(fn, *args, **kwargs)
+
+        def finished(_future):  # on the worker thread
+            if metrics.enabled:
+                metrics.observe(f"tasks.{name}", time.perf_counter_ns() - start)
+            self._events.put(("done", task))
+        task.future.add_done_callback(finished)
+        return task
+
+    def cancel(self, *names):
+        for name in names:
+            task = self._running.pop(name, None)
+            if task is not None:
+                if not task.done():
+                    count("tasks.cancelled")
+                task.cancel()
+
+    def busy(self):
+        return any(not t.done() for t in self._running.values())
+
+    def poll(self):
+        """Deliver queued results and progress to their callbacks; call from the consumer thread.
+
+        Never raises: a failed job without on_error, or a callback that raises,
+        is printed to stderr and the remaining events are still delivered.
+        """
+        while True:
+            try:
+                kind, task = self._events.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self._deliver(kind, task)
+            except Exception:
+                count("tasks.failed")
+                print(f"Task {task.name!r} failed:", file=sys.stderr)
+                traceback.print_exc()
+
+    def _deliver(self, kind, task):
+        if task.cancelled:
+            return  # superseded: drop whatever it produced
+        if kind == "progress":
+            task.on_progress(task.progress)
+            return
+        if self._running.get(task.name) is task:
+            del self._running[task.name]
+        try:
+            result = task.future.result()
+        except (TaskCancelled, CancelledError):
+            return
+        except Exception as e:
+            if task.on_error is None:
+                raise
+            task.on_error(e)
+            return
+        if task.on_done is not None:
+            task.on_done(result)
+
+    def map(self, fn, *iterables):
+        """Batch jobs: results of fn over the iterables, in order (blocks)."""
+        return list(self._pool.map(fn, *iterables))
+
+    def shutdown(self, wait=True):
+        self.cancel(*list(self._running))
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def _takes_progress(fn):
+    try:
+        return "progress" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):  # builtins without a signature
+        return False
@@ -0,0 +1,216 @@
+# logic/valuation.py
+# Mark-to-market of a Portfolio against the latest price per ticker.
+#
+# Lots are folded into per-(ticker, asset type) totals of quantity and cost
+# with one bincount over the store's columns. Unrealised P&L is then kept
+# per ticker and per (ticker, asset type), along with its running totals,
+# so a price tick only recomputes the ticked tickers' rows and adds the
+# difference to the totals: the cost depends on how many tickers moved,
+# not on how many lots are held.
+#
+# A ticker with no price yet counts at cost (P&L 0), so market value is
+# always cost basis + unrealised P&L.
+#
+#     val = Valuation(portfolio, store.latest_prices())
+#     val.update({"AAPL": 191.2})     # one tick
+#     val.market_value(), val.unrealised_pnl(), val.by_asset_type()
+
+import numpy as np
+
+
+class Valuation:
+    """Market value, cost basis and unrealised P&L of a Portfolio, kept current as prices tick.
+
+    Follows the portfolio through subscribe(): added lots are folded in
+    directly, edits/deletes/reloads rebuild the totals on the next read.
+    """
+
+    def __init__(self, portfolio, prices=None):
+        self._store = portfolio._store
+        self.prices = {}        # ticker -> latest price, including tickers not held
+        self._stale = True
+        portfolio.subscribe(self._on_change)
+        if prices:
+            self.update(prices)
+
+    #  prices
+    def update(self, prices):
+        """Apply a tick ({ticker: price}); only those tickers are revalued."""
+        prices = {t.upper(): float(p) for t, p in prices.items()}
+        bad = [t for t, p in prices.items() if not p > 0]  # also catches nan
+        if bad:
+            raise ValueError(f"Price must be greater than 0 for {', '.join(bad)}.")
+        self.prices.update(prices)
+        if self._stale:
+            return  # the rebuild on the next read picks them up
+        codes = self._store.tickers.codes
+        held = [(codes[t], p) for t, p in prices.items() if codes.get(t, len(self.mark)) < len(self.mark)]
+        if len(held) == 1:
+            self._revalue_one(*held[0])  # the usual tick: plain scalars beat fancy indexing
+        elif held:
+            rows, marks = zip(*held)
+            rows = np.array(rows)
+            self.mark[rows] = marks
+            self._revalue(rows)
+
+    #  totals
+    def cost_basis(self):
+        self._ensure()
+        return self.total_cost
+
+    def unrealised_pnl(self):
+        self._ensure()
+        return self.total_pnl
+
+    def market_value(self):
+        self._ensure()
+        return self.total_cost + self.total_pnl
+
+    def unpriced(self):
+        """Held tickers with no price yet (valued at cost)."""
+        self._ensure()
+        return [self._store.tickers[c] for c in np.flatnonzero((self.qty > 0) & np.isnan(self.mark))]
+
+    #  breakdowns
+    def by_ticker(self):
+        """{ticker: {"quantity", "cost", "price", "value", "pnl"}}; price is None when unpriced."""
+        self._ensure()
+        out = {}
+        for c in np.flatnonzero(self.qty > 0):
+            mark = self.mark[c]
+            out[self._store.tickers[c]] = {"quantity": int(self.qty[c]), "cost": float(self.cost[c]),
+                                           "price": None if np.isnan(mark) else float(mark),
+                                           "value": float(self.cost[c] + self.pnl[c]), "pnl": float(self.pnl[c])}
+        return out
+
+    def by_asset_type(self):
+        """{asset type: {"cost", "value", "pnl"}}."""
+        self._ensure()
+        out = {}
+        for a in np.flatnonzero(self.qty_ta.sum(axis=0) > 0):
+            cost, pnl = float(self.asset_cost[a]), float(self.asset_pnl[a])
+            out[self._store.asset_types[a]] = {"cost": cost, "value": cost + pnl, "pnl": pnl}
+        return out
+
+    def summary(self):
+        self._ensure()
+        return {"cost": self.total_cost, "value": self.total_cost + self.total_pnl,
+                "pnl": self.total_pnl, "unpriced": self.unpriced()}
+
+    #  keeping up with the portfolio
+    def _on_change(self, change):
+        if change.added and not (change.edited or change.deleted or change.reloaded) and not self._stale:
+            self._add_lots(change.added)
+        else:
+            self._stale = True  # old values of edited/deleted lots are gone, so start over
+
+    def _ensure(self):
+        if self._stale:
+            self.rebuild()
+
+    def rebuild(self):
+        """Fold every live lot into the per-(ticker, asset type) totals in one pass."""
+        store = self._store
+        n_t, n_a = len(store.tickers), len(store.asset_types)
+        self.qty_ta = np.zeros((n_t, n_a))
+        self.cost_ta = np.zeros((n_t, n_a))
+        if store.nrows:
+            pair = np.frombuffer(store.ticker_code, dtype=np.intc) * n_a + np.frombuffer(store.asset_code, dtype=np.intc)
+            qty = np.frombuffer(store.quantity, dtype=np.int64).astype(np.float64)
+            if store.dead:
+                qty *= np.frombuffer(store.alive, dtype=np.uint8)  # tombstones count for nothing
+            self.qty_ta = np.bincount(pair, weights=qty, minlength=n_t * n_a).reshape(n_t, n_a)
+            self.cost_ta = np.bincount(pair, weights=store.values(), minlength=n_t * n_a).reshape(n_t, n_a)
+        self.qty = self.qty_ta.sum(axis=1)
+        self.cost = self.cost_ta.sum(axis=1)
+        self.asset_cost = self.cost_ta.sum(axis=0)
+        self.total_cost = float(self.cost.sum())
+        self.mark = np.full(n_t, np.nan)
+        for ticker, price in self.prices.items():
+            c = store.tickers.codes.get(ticker)
+            if c is not None:
+                self.mark[c] = price
+        self.pnl = np.zeros(n_t)
+        self.pnl_ta = np.zeros((n_t, n_a))
+        self.total_pnl = 0.0
+        self.asset_pnl = np.zeros(n_a)
+        self._stale = False
+        self._revalue(np.arange(n_t))
+
+    def _add_lots(self, ids):
+        store = self._store
+        if len(store.tickers) > len(self.mark) or len(store.asset_types) > self.qty_ta.shape[1]:
+            self._stale = True  # a new ticker or asset type: arrays must grow
+            return
+        rows = np.frombuffer(store.row_of, dtype=np.int64)[np.asarray(ids, dtype=np.int64)]
+        if (rows < 0).any():
+            self._stale = True  # added then deleted within one batch
+            return
+        t = np.frombuffer(store.ticker_code, dtype=np.intc)[rows]
+        a = np.frombuffer(store.asset_code, dtype=np.intc)[rows]
+        qty = np.frombuffer(store.quantity, dtype=np.int64)[rows].astype(np.float64)
+        cost = np.frombuffer(store.price, dtype=np.float64)[rows] * qty
+        np.add.at(self.qty_ta, (t, a), qty)
+        np.add.at(self.cost_ta, (t, a), cost)
+        np.add.at(self.qty, t, qty)
+        np.add.at(self.cost, t, cost)
+        np.add.at(self.asset_cost, a, cost)
+        self.total_cost += float(cost.sum())
+        self._revalue(np.unique(t))
+
+    def _revalue_one(self, row, mark):
+        self.mark[row] = mark
+        pnl = float(self.qty[row]) * mark - float(self.cost[row])
+        pnl_ta = self.qty_ta[row] * mark - self.cost_ta[row]
+        self.total_pnl += pnl - float(self.pnl[row])
+        self.asset_pnl += pnl_ta - self.pnl_ta[row]
+        self.pnl[row] = pnl
+        self.pnl_ta[row] = pnl_ta
+
+    def _revalue(self, rows):
+        """Recompute P&L of the given ticker codes and move the totals by the difference."""
+        mark = self.mark[rows]
+        priced = ~np.isnan(mark)
+        mark = np.where(priced, mark, 0.0)
+        pnl = np.where(priced, self.qty[rows] * mark - self.cost[rows], 0.0)
+        pnl_ta = np.where(priced[:, None], self.qty_ta[rows] * mark[:, None] - self.cost_ta[rows], 0.0)
+        self.total_pnl += float((pnl - self.pnl[rows]).sum())
+        self.asset_pnl += (pnl_ta - self.pnl_ta[rows]).sum(axis=0)
+        self.pnl[rows] = pnl
+        self.pnl_ta[rows] = pnl_ta
+
+
+# tick latency against a full revaluation: python -m logic.valuation
+if __name__ == "__main__":
+    import time
+    from logic.data_handler import Portfolio
+
+    rng = np.random.default_rng(1)
+    n, n_tickers = 100_000, 500
+    tickers = np.array(["T" + chr(65 + i // 26 % 26) + chr(65 + i % 26) + chr(65 + i // 676) for i in range(n_tickers)])
+    kinds = np.array(["Stock", "ETF", "Crypto", "Bond", "Other"])
+    pf = Portfolio()
+    with pf.batch():
+        pf._add_rows(tickers[rng.integers(0, n_tickers, n)], np.round(rng.uniform(1, 500, n), 2),
+                     rng.integers(1, 100, n), np.full(n, "2025-01-02"), kinds[rng.integers(0, 5, n)])
+    marks = {str(t): float(p) for t, p in zip(tickers, rng.uniform(1, 500, n_tickers))}
+
+    val = Valuation(pf, marks)
+    t = time.perf_counter()
+    val.rebuild()
+    full = time.perf_counter() - t
+
+    ticks = 10_000
+    names = tickers[rng.integers(0, n_tickers, ticks)].tolist()
+    moves = rng.uniform(1, 500, ticks).tolist()
+    t = time.perf_counter()
+    for name, price in zip(names, moves):
+        val.update({name: price})
+    tick = (time.perf_counter() - t) / ticks
+
+    print(f"{n:,} lots, {n_tickers} tickers")
+    print(f"full revaluation: {full * 1e3:8.2f} ms")
+    print(f"one-ticker tick:  {tick * 1e6:8.1f} us  ({full / tick:.0f}x)")
+    pnl = val.unrealised_pnl()
+    val.rebuild()
+    print(f"incremental P&L matches a rebuild: {abs(pnl - val.unrealised_pnl()) < 1e-6 * abs(val.cost_basis())}")
@@ -1,11 +1,18 @@
 # main.py
 # Entry point for the Investment Management System
+# python main.py             -> the GUI
+# python main.py <command>   -> headless, see cli.py (tkinter/matplotlib never imported)
 
-from gui.interface import InvestmentGUI
-import tkinter as tk
+import sys
 
 # create the main application window
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+    import tkinter as tk
+    from gui.interface import InvestmentGUI  # pulls in matplotlib, so only for the GUI
+
     root = tk.Tk()
     app = InvestmentGUI(root)  # create instance of the GUI
     root.mainloop()            # start the Tkinter event loop
@@ -0,0 +1,32 @@
+import pytest
+
+from logic.algorithms import recursive_min_max, rolling_z_score, z_score_normalisation
+
+
+def test_rolling_z_score_matches_full_z_score_per_window():
+    values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0, 3.0]
+    z = rolling_z_score(values, 4)
+    for i in range(3, len(values)):
+        assert z[i] == pytest.approx(z_score_normalisation(values[i - 3:i + 1])[-1])
+
+
+def test_rolling_z_score_at_high_price_level():
+    values = [1e6 + 0.01 * i for i in range(20)]  # each bar is the top of its 3-bar window
+    assert rolling_z_score(values, 3)[2:] == pytest.approx([1.2247449] * 18, abs=1e-4)
+
+
+def test_recursive_min_max():
+    assert recursive_min_max([3, 1, 4, 1, 5, 9, 2, 6]) == (1, 9)
+    assert recursive_min_max([7]) == (7, 7)
+    with pytest.raises(ValueError):
+        recursive_min_max([])
+
+
+def test_rolling_z_score_does_not_drift_on_a_long_high_level_walk():
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    x = 1e6 + np.cumsum(np.random.default_rng(1).normal(0, 1.0, 20_000))
+    for window in (3, 50):
+        windows = sliding_window_view(x, window)
+        exact = (x[window - 1:] - windows.mean(axis=1)) / windows.std(axis=1)
+        assert rolling_z_score(x.tolist(), window)[window - 1:] == pytest.approx(exact, abs=1e-6)
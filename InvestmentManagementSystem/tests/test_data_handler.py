@@ -0,0 +1,39 @@
+import pytest
+
+from logic.data_handler import BatchError, Portfolio
+
+BAD_ROWS = [
+    (None, 1, 1.0, "2025-01-01"),
+    ("", 1, 1.0, "2025-01-01"),
+    ("AAPL1", 1, 1.0, "2025-01-01"),
+    ("AAPL", None, 1, "2025-01-01"),
+    ("AAPL", "", 1, "2025-01-01"),
+    ("AAPL", 0, 1, "2025-01-01"),
+    ("AAPL", 1.0, None, "2025-01-01"),
+    ("AAPL", 1.0, "1.5", "2025-01-01"),
+    ("AAPL", 1.0, -1, "2025-01-01"),
+    ("AAPL", 1.0, 1, None),
+    ("AAPL", 1.0, 1, ""),
+]
+
+
+@pytest.mark.parametrize("row", BAD_ROWS)
+def test_add_many_rejects_what_add_investment_rejects(row):
+    pf = Portfolio()
+    with pytest.raises(ValueError):
+        pf.add_investment(*row)
+    with pytest.raises(BatchError):
+        pf.add_many([row])
+    assert len(pf.items) == 0
+
+
+@pytest.mark.parametrize("row", [
+    ("aapl", "150.5", "10", "2025-01-01", "Stock"),
+    ("AAPL", 150.5, 10, "2025-01-01", "Stock"),
+    ("AAPL", 150, 10.0, "2025-01-01", "Stock"),
+])
+def test_add_many_accepts_what_add_investment_accepts(row):
+    pf = Portfolio()
+    single = pf.add_investment(*row)
+    (batch,) = pf.add_many([row])
+    assert str(single) == str(batch)
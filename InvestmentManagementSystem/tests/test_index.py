@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from logic.data_handler import Portfolio
+
+TICKERS = ["AAPL", "TSLA", "MSFT", "BTC"]
+ASSET_TYPES = ["Stock", "ETF", "Crypto"]
+QUERIES = [
+    {"ticker": "AAPL"},
+    {"ticker": "NOPE"},
+    {"asset_type": "Crypto"},
+    {"start": "2025-03-01"},
+    {"end": "2025-02-15"},
+    {"start": "2025-02-01", "end": "2025-04-30"},
+    {"ticker": "TSLA", "asset_type": "Stock"},
+    {"ticker": "MSFT", "start": "2025-01-10", "end": "2025-05-20"},
+    {"ticker": "BTC", "asset_type": "Crypto", "start": "2025-06-01", "end": "2025-06-01"},
+    {},
+]
+
+
+def random_lot(rng):
+    day = rng.choice([f"2025-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}", "unknown"])
+    return (rng.choice(TICKERS), rng.randint(1, 500), rng.randint(1, 50), day, rng.choice(ASSET_TYPES))
+
+
+def scan(pf, ticker=None, asset_type=None, start=None, end=None):
+    """What find() should return, by looking at every lot."""
+    dated = start is not None or end is not None
+    found = [inv for inv in pf.items
+             if (ticker is None or inv.ticker == ticker)
+             and (asset_type is None or inv.asset_type == asset_type)
+             and (not dated or (inv.date != "unknown"
+                                and (start is None or inv.date >= start)
+                                and (end is None or inv.date <= end)))]
+    return [inv.id for inv in found]
+
+
+def check_queries(pf):
+    for query in QUERIES:
+        found = pf.find(**query)
+        assert sorted(inv.id for inv in found) == sorted(scan(pf, **query)), query
+        if "start" in query or "end" in query:
+            dates = [inv.date for inv in found]
+            assert dates == sorted(dates), query  # oldest first
+
+
+@pytest.fixture
+def portfolio():
+    rng = random.Random(7)
+    pf = Portfolio()
+    pf.add_many([random_lot(rng) for _ in range(400)])
+    return pf, rng
+
+
+def test_queries_match_a_scan(portfolio):
+    pf, _rng = portfolio
+    check_queries(pf)
+
+
+def test_indexes_follow_edits_and_deletes(portfolio):
+    pf, rng = portfolio
+    pf.find(ticker="AAPL")  # build the indexes so they are maintained in place
+    ids = [inv.id for inv in pf.items]
+    for inv_id in rng.sample(ids, 60):
+        ticker, _price, _qty, day, asset_type = random_lot(rng)
+        pf.edit_by_id(inv_id, new_ticker=ticker, new_date=day, new_asset_type=asset_type)
+    deleted = rng.sample(ids, 80)
+    for inv_id in deleted[:40]:
+        pf.delete_by_id(inv_id)
+    pf.delete_many(deleted[40:])
+    pf.add_many([random_lot(rng) for _ in range(30)])
+    assert pf._store.index.built and pf._store.dead  # incremental path, tombstones still there
+    check_queries(pf)
+
+    pf.vacuum()  # renumbers rows: indexes are rebuilt on the next query
+    check_queries(pf)
@@ -0,0 +1,21 @@
+from logic.journal import Journal
+
+
+def test_torn_tail_is_cut_off_before_appending(tmp_path):
+    path = tmp_path / "investments.journal"
+    journal = Journal(path, commit_interval=0)
+    journal.append("a", 1, "AAPL")
+    journal.append("a", 2, "TSLA")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('[3,"a",3,"MS')  # crash mid-write
+
+    journal = Journal(path, commit_interval=0)
+    assert journal.seq == 2
+    journal.append("a", 3, "NVDA")
+    journal.append("a", 4, "AMZN")
+    journal.close()
+
+    journal = Journal(path)  # restart again: nothing after the tear is lost
+    journal.close()
+    assert [args[1] for _seq, _op, args in Journal.read(path)] == ["AAPL", "TSLA", "NVDA", "AMZN"]
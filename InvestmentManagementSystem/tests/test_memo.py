@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from logic import decimate, indicators, jobs
+from logic.memo import MISS, MemoCache, fingerprint
+
+
+def test_same_named_functions_do_not_share_entries():
+    cache = MemoCache()
+    prices = [3.0, 1.0, 2.0]
+    assert jobs.min_max.__name__ == indicators.min_max.__name__ == decimate.min_max.__name__
+    cache.put(jobs.min_max, prices, jobs.min_max(prices))
+    assert cache.get(indicators.min_max, prices) is MISS
+    assert cache.get(decimate.min_max, prices) is MISS
+    assert cache.get(jobs.min_max, prices) == (1.0, 3.0, 1, 0)
+
+
+def test_hits_are_read_only_and_not_copied():
+    cache = MemoCache()
+    prices = [1.0, 2.0, 3.0]
+    fp = fingerprint(prices)
+    stored = cache.put("f", prices, {"ema": [1.0, 2.0], "z": np.zeros(3)}, fp=fp)
+    hit = cache.get("f", prices, fp=fp)
+    assert hit is stored
+    assert hit["ema"] == (1.0, 2.0)
+    with pytest.raises(TypeError):
+        hit["ema"] = []
+    with pytest.raises(ValueError):
+        hit["z"][0] = 1.0
+
+
+def test_call_with_fp_skips_rehashing_but_still_misses_on_new_series():
+    cache = MemoCache()
+    prices = [1.0, 2.0, 3.0]
+    fp = fingerprint(prices)
+    assert cache.call(sum, prices, fp=fp) == 6.0
+    assert cache.call(sum, prices, fp=fp) == 6.0
+    assert cache.call(sum, [1.0, 2.0, 4.0]) == 7.0
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from logic import algorithms
+from logic.pipeline import from_arrays, pipeline, with_z_score
+
+
+def z_column(prices, window, chunk):
+    chunks = pipeline(from_arrays(np.arange(len(prices)), prices, chunk=chunk), with_z_score(window=window))
+    return np.concatenate([c["z"] for c in chunks])
+
+
+def high_level_walk(n, seed=1):
+    return 1e6 + np.cumsum(np.random.default_rng(seed).normal(0, 1.0, n))
+
+
+@pytest.mark.parametrize("window", [1, 3, 50])
+def test_rolling_z_matches_rolling_z_score_at_high_price_level(window):
+    x = high_level_walk(5000)
+    z = z_column(x, window, chunk=777)
+    assert z == pytest.approx(algorithms.rolling_z_score(x.tolist(), window), abs=1e-6)
+
+
+def test_cumulative_z_matches_z_score_normalisation_at_high_price_level():
+    x = high_level_walk(5000)
+    z = z_column(x, None, chunk=777)
+    for i in (1, 10, 776, 777, 2500, 4999):
+        assert z[i] == pytest.approx(algorithms.z_score_normalisation(x[:i + 1].tolist())[-1], abs=1e-6)
+
+
+def test_far_off_first_value_does_not_spoil_later_windows():
+    x = high_level_walk(20_000)
+    x[0] = 1.0
+    window = 50
+    z = z_column(x, window, chunk=3001)
+    windows = sliding_window_view(x, window)
+    exact = (x[window - 1:] - windows.mean(axis=1)) / windows.std(axis=1)
+    assert z[window - 1:] == pytest.approx(exact, abs=1e-6)
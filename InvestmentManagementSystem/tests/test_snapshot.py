@@ -0,0 +1,102 @@
+import json
+from datetime import date as _date
+
+import numpy as np
+import pytest
+
+from logic.data_handler import Portfolio
+from logic.snapshot import (HEADER, HEADER_SIZE, MAGIC, RECORD_DTYPES, Snapshot,
+                            csv_to_snapshot, snapshot_to_csv)
+
+LOTS = [
+    ("AAPL", 150.0, 10, "2025-01-02", "Stock"),
+    ("TSLA", 250.5, 5, "2025-02-03", "Stock"),
+    ("BTC", 60000.0, 1, "sometime in 2024", "Crypto"),
+    ("VWRL", 100.0, 7, "2025-04-05", "ETF"),
+]
+
+
+def write_old_version(path, version, lots):
+    """A snapshot in an older layout, written the way that version's writer did."""
+    tickers, asset_types, odd_dates = [], [], []
+
+    def code(table, value):
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    dtype = RECORD_DTYPES[version]
+    records = np.zeros(len(lots), dtype=dtype)
+    for i, (ticker, price, quantity, date, asset_type) in enumerate(lots):
+        records[i]["price"], records[i]["quantity"] = price, quantity
+        records[i]["ticker"] = code(tickers, ticker)
+        try:
+            records[i]["date"] = _date.fromisoformat(date).toordinal()
+        except ValueError:
+            records[i]["date"] = -(code(odd_dates, date) + 1)
+        if version >= 2:
+            records[i]["asset_type"] = code(asset_types, asset_type)
+    tables = {"tickers": tickers, "odd_dates": odd_dates}
+    if version >= 2:
+        tables["asset_types"] = asset_types
+    strings = json.dumps(tables).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, version, dtype.itemsize, len(lots), HEADER_SIZE + records.nbytes,
+                            len(strings)).ljust(HEADER_SIZE, b"\0"))
+        f.write(records.tobytes())
+        f.write(strings)
+
+
+def loaded(path):
+    pf = Portfolio()
+    pf.load_snapshot(str(path))
+    return pf
+
+
+def test_current_version_round_trip_keeps_ids_and_next_id(tmp_path):
+    pf = Portfolio()
+    ids = [inv.id for inv in pf.add_many(LOTS)]
+    pf.delete_by_id(ids[1])
+    pf.save_snapshot(str(tmp_path / "p.snap"))
+
+    back = loaded(tmp_path / "p.snap")
+    assert [inv.id for inv in back.items] == [ids[0], ids[2], ids[3]]
+    assert [str(inv) for inv in back.items] == [str(inv) for inv in pf.items]
+    assert back.total_value() == pytest.approx(pf.total_value())
+    assert back.add_investment("MSFT", 1, 1, "2025-05-06").id == ids[-1] + 1
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_older_versions_load_with_ids_from_one(tmp_path, version):
+    path = tmp_path / f"v{version}.snap"
+    write_old_version(str(path), version, LOTS)
+    with Snapshot(str(path)) as snap:
+        assert snap.version == version
+        assert snap.row(2)[:4] == LOTS[2][:4]
+
+    back = loaded(path)
+    assert [inv.id for inv in back.items] == [1, 2, 3, 4]
+    expected = LOTS if version >= 2 else [(*lot[:4], "Unknown") for lot in LOTS]
+    assert list(back._store.iter_rows()) == expected
+    assert back.find(ticker="TSLA")[0].id == 2
+    assert back.add_investment("MSFT", 1, 1, "2025-05-06").id == 5
+
+
+def test_csv_round_trip_through_snapshot(tmp_path):
+    pf = Portfolio()
+    pf.add_many(LOTS)
+    pf.save_csv(str(tmp_path / "in.csv"))
+    assert csv_to_snapshot(str(tmp_path / "in.csv"), str(tmp_path / "p.snap")) == []
+    snapshot_to_csv(str(tmp_path / "p.snap"), str(tmp_path / "out.csv"))
+    assert (tmp_path / "out.csv").read_text() == (tmp_path / "in.csv").read_text()
+
+
+@pytest.mark.parametrize("keep", [0, 10, HEADER_SIZE + 8, -5])
+def test_truncated_snapshot_raises_value_error(tmp_path, keep):
+    pf = Portfolio()
+    pf.add_many(LOTS)
+    pf.save_snapshot(str(tmp_path / "p.snap"))
+    data = (tmp_path / "p.snap").read_bytes()
+    (tmp_path / "p.snap").write_bytes(data[:keep])
+    with pytest.raises(ValueError):
+        loaded(tmp_path / "p.snap")
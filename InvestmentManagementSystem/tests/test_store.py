@@ -0,0 +1,82 @@
+import pytest
+
+from logic.data_handler import Portfolio
+from logic.store import ColumnStore
+
+LOTS = [
+    ("AAPL", 150.0, 10, "2025-01-02", "Stock"),
+    ("TSLA", 250.5, 5, "2025-02-03", "Stock"),
+    ("BTC", 60000.0, 1, "sometime in 2024", "Crypto"),  # kept as an odd date
+    ("AAPL", 155.0, 3, "2025-03-04", "Stock"),
+    ("VWRL", 100.0, 7, "2025-04-05", "ETF"),
+]
+
+
+def filled_store():
+    store = ColumnStore()
+    ids = [store.append(*lot) for lot in LOTS]
+    return store, ids
+
+
+def values_by_id(store):
+    return {store.ids[row]: store.row(row) for row in store.live_rows()}
+
+
+def test_rows_round_trip_with_interned_strings():
+    store, ids = filled_store()
+    assert ids == [1, 2, 3, 4, 5]
+    assert [store.row(store.row_for_id(i)) for i in ids] == LOTS
+    assert list(store.iter_rows()) == LOTS
+    assert len(store.tickers) == 4  # AAPL stored once
+
+
+def test_delete_tombstones_without_moving_other_lots():
+    store, ids = filled_store()
+    rows_before = {i: store.row_for_id(i) for i in ids}
+    assert store.delete(store.row_for_id(2)) == LOTS[1]
+    assert len(store) == 4 and store.nrows == 5
+    with pytest.raises(KeyError):
+        store.row_for_id(2)
+    assert all(store.row_for_id(i) == rows_before[i] for i in ids if i != 2)
+    assert list(store.iter_rows()) == [LOTS[0], *LOTS[2:]]
+    assert [store.live_row(p) for p in range(len(store))] == [0, 2, 3, 4]
+    assert store.totals_by("ticker") == {"AAPL": 1965.0, "BTC": 60000.0, "VWRL": 700.0}
+
+
+def test_vacuum_keeps_ids_and_remaps_rows():
+    store, ids = filled_store()
+    for i in (1, 4):
+        store.delete(store.row_for_id(i))
+    before = values_by_id(store)
+    store.vacuum()
+    assert store.nrows == len(store) == 3 and store.dead == 0
+    assert values_by_id(store) == before
+    assert [store.row_for_id(i) for i in (2, 3, 5)] == [0, 1, 2]
+    assert store.row_of[1] == store.row_of[4] == -1
+    assert store.append(*LOTS[0]) == 6  # ids are never reused
+
+
+def test_vacuum_runs_once_half_the_rows_are_dead():
+    store = ColumnStore()
+    store.VACUUM_MIN = 4
+    ids = [store.append(*LOTS[i % len(LOTS)]) for i in range(10)]
+    for i in ids[:4]:
+        store.delete(store.row_for_id(i))
+    assert store.dead == 4 and store.nrows == 10
+    store.delete(store.row_for_id(ids[4]))  # 5 of 10 dead
+    assert store.dead == 0 and store.nrows == 5
+    assert [store.ids[r] for r in store.live_rows()] == ids[5:]
+
+
+def test_portfolio_ids_survive_deletes_and_vacuum():
+    pf = Portfolio()
+    added = pf.add_many(LOTS)
+    ids = [inv.id for inv in added]
+    pf.delete_by_id(ids[0])
+    pf.delete_many([ids[2]])
+    pf.vacuum()
+    assert [inv.id for inv in pf.items] == [ids[1], ids[3], ids[4]]
+    assert str(pf.get(ids[4])) == "VWRL (ETF): 7 shares at 100.0 each on 2025-04-05"
+    assert pf.total_value() == pytest.approx(pf._store.total_value())
+    with pytest.raises(KeyError):
+        pf.get(ids[0])